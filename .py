@@ -1,96 +1,3435 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+import asyncio
+import copy
+import hashlib
+import io
 import json
-from typing import Optional, Dict, Any
+import mmap
+import os
+import queue
+import random
+import sqlite3
+import struct
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional, Dict, Any, Iterable, Iterator, List, BinaryIO, Tuple, Union, Callable
 from pathlib import Path
+import heapq
+import threading
 import time
+import uuid
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    import aiohttp
+except ImportError:  # only needed for AsyncSunoMIDIUploader
+    aiohttp = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# A MIDI file on disk, its raw bytes, or a binary file object positioned at its start
+MIDISource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+
+def _is_midi_path(source: MIDISource) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def _midi_upload_name(source: MIDISource, filename: Optional[str] = None) -> str:
+    """
+    Validate a MIDI source and return the filename to upload it under
+    """
+    if _is_midi_path(source):
+        midi_file = Path(source)
+        if not midi_file.exists():
+            raise FileNotFoundError(f"MIDI file not found: {source}")
+        name = filename or midi_file.name
+    else:
+        if not isinstance(source, (bytes, bytearray, memoryview)) and not hasattr(source, 'read'):
+            raise TypeError("MIDI source must be a path, bytes or a binary file object")
+        name = filename or getattr(source, 'name', None)
+        name = Path(name).name if isinstance(name, str) else 'upload.mid'
+    
+    if not Path(name).suffix.lower() in ['.mid', '.midi']:
+        raise ValueError("File must be a MIDI file (.mid or .midi)")
+    return name
+
+
+def _remaining_size(file_obj: BinaryIO) -> Optional[int]:
+    """
+    Bytes left in a seekable file object, or None if it cannot seek
+    """
+    try:
+        if not file_obj.seekable():
+            return None
+        position = file_obj.tell()
+        end = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(position)
+        return end - position
+    except (AttributeError, OSError):
+        return None
+
+
+def _midi_source_size(source: MIDISource) -> int:
+    """
+    Best-effort size of a MIDI source in bytes (0 if unknown)
+    """
+    if _is_midi_path(source):
+        try:
+            return os.path.getsize(source)
+        except OSError:
+            return 0
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).nbytes
+    return _remaining_size(source) or 0
+
+
+class _BytesReader:
+    """
+    Minimal binary reader over an in-memory buffer that copies only what is read
+    """
+    
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+    
+    def __len__(self) -> int:
+        return self._view.nbytes
+    
+    def getbuffer(self) -> memoryview:
+        """
+        The unread part of the buffer, without copying
+        """
+        return self._view[self._position:]
+    
+    def read(self, size: int = -1) -> bytes:
+        end = self._view.nbytes if size is None or size < 0 else self._position + size
+        chunk = self._view[self._position:end].tobytes()
+        self._position += len(chunk)
+        return chunk
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence != os.SEEK_SET:
+            raise io.UnsupportedOperation("only absolute seeks are supported")
+        self._position = offset
+        return offset
+
+
+@contextmanager
+def _open_midi_source(source: MIDISource) -> Iterator[Tuple[BinaryIO, int]]:
+    """
+    Yield a readable binary stream over a MIDI source and the number of bytes to send
+    """
+    if _is_midi_path(source):
+        with open(source, 'rb') as f:
+            yield f, os.fstat(f.fileno()).st_size
+        return
+    
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        reader = _BytesReader(source)
+        yield reader, len(reader)
+        return
+    
+    size = _remaining_size(source)
+    if size is None:
+        # Non-seekable stream: the length must be known up front
+        reader = _BytesReader(source.read())
+        yield reader, len(reader)
+        return
+    yield source, size
+
+
+class InvalidMIDIError(ValueError):
+    """
+    Raised when a MIDI file fails local header validation
+    """
+
+
+def _check_midi_buffer(buffer, label: str) -> Dict[str, int]:
+    """
+    Walk the chunk headers of a Standard MIDI File held in a buffer or mmap
+    """
+    size = len(buffer)
+    if size < 14 or buffer[:4] != b'MThd':
+        raise InvalidMIDIError(f"{label}: missing MThd header")
+    
+    header_length, midi_format, track_count, division = struct.unpack_from('>IHHH', buffer, 4)
+    if header_length < 6:
+        raise InvalidMIDIError(f"{label}: MThd chunk is {header_length} bytes, expected at least 6")
+    if midi_format > 2:
+        raise InvalidMIDIError(f"{label}: unknown MIDI format {midi_format}")
+    if track_count == 0 or (midi_format == 0 and track_count != 1):
+        raise InvalidMIDIError(f"{label}: format {midi_format} file declares {track_count} tracks")
+    
+    offset = 8 + header_length
+    tracks_found = 0
+    while offset + 8 <= size:
+        chunk_type = bytes(buffer[offset:offset + 4])
+        chunk_length, = struct.unpack_from('>I', buffer, offset + 4)
+        offset += 8
+        if offset + chunk_length > size:
+            raise InvalidMIDIError(
+                f"{label}: {chunk_type!r} chunk at byte {offset - 8} is truncated "
+                f"({chunk_length} bytes declared, {size - offset} present)"
+            )
+        if chunk_type == b'MTrk':
+            tracks_found += 1
+        offset += chunk_length
+    
+    if tracks_found < track_count:
+        raise InvalidMIDIError(
+            f"{label}: header declares {track_count} tracks but only {tracks_found} MTrk chunks found"
+        )
+    
+    return {"format": midi_format, "tracks": track_count, "division": division}
+
+
+def validate_midi(source: MIDISource) -> Dict[str, int]:
+    """
+    Check a MIDI file's MThd header and MTrk chunk lengths without touching the network
+    
+    Files on disk are memory-mapped, so only the chunk headers are read.
+    File objects are left at the position they started from.
+    
+    Args:
+        source: Path to the MIDI file, or its contents as bytes, a memoryview
+            or a seekable binary file object
+        
+    Returns:
+        Dict with the file's "format", "tracks" and "division"
+        
+    Raises:
+        InvalidMIDIError: If the header or any chunk length is invalid
+    """
+    if _is_midi_path(source):
+        with open(source, 'rb') as f:
+            return validate_midi(f)
+    
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return _check_midi_buffer(memoryview(source).cast('B'), "<bytes>")
+    
+    if isinstance(source, _BytesReader):
+        return _check_midi_buffer(source.getbuffer(), "<bytes>")
+    
+    label = getattr(source, 'name', None)
+    label = label if isinstance(label, str) else "<stream>"
+    
+    try:
+        fileno = source.fileno()
+        position = source.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileno = None
+    
+    if fileno is not None and position == 0:
+        if os.fstat(fileno).st_size == 0:
+            raise InvalidMIDIError(f"{label}: file is empty")
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+            return _check_midi_buffer(mapped, label)
+    
+    if _remaining_size(source) is None:
+        raise ValueError(f"{label}: cannot validate a non-seekable stream")
+    position = source.tell()
+    try:
+        return _check_midi_buffer(source.read(), label)
+    finally:
+        source.seek(position)
+
+
+def validate_midi_directory(directory: str, recursive: bool = True,
+                            max_workers: int = 8) -> Dict[str, Union[InvalidMIDIError, OSError]]:
+    """
+    Pre-flight check every .mid/.midi file under a directory
+    
+    Args:
+        directory: Directory to scan
+        recursive: Also scan subdirectories
+        max_workers: Files validated in parallel
+        
+    Returns:
+        Dict mapping each invalid or unreadable file's path to its error
+        (an InvalidMIDIError, or the OSError raised reading it; empty if
+        all are valid)
+    """
+    root = Path(directory)
+    walker = root.rglob('*') if recursive else root.glob('*')
+    paths = [str(path) for path in walker
+             if path.suffix.lower() in ['.mid', '.midi'] and path.is_file()]
+    
+    def check(path: str) -> Optional[Union[InvalidMIDIError, OSError]]:
+        try:
+            validate_midi(path)
+        except (InvalidMIDIError, OSError) as e:
+            # e.g. PermissionError, or FileNotFoundError for a file deleted mid-scan
+            return e
+        return None
+    
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for path, error in zip(paths, executor.map(check, paths)):
+            if error is not None:
+                failures[path] = error
+    return failures
+
+
+def _file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    SHA-256 of a file's contents, read in chunks
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _midi_digest(source: MIDISource, chunk_size: int = 1024 * 1024) -> Optional[str]:
+    """
+    SHA-256 of a MIDI source's contents, or None if it cannot be re-read
+    
+    File objects are rewound to where they started so they can still be uploaded.
+    """
+    if _is_midi_path(source):
+        return _file_sha256(source, chunk_size)
+    
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(memoryview(source).cast('B'))
+    else:
+        if _remaining_size(source) is None:
+            return None
+        position = source.tell()
+        for chunk in iter(lambda: source.read(chunk_size), b''):
+            digest.update(chunk)
+        source.seek(position)
+    return digest.hexdigest()
+
+
+def _midi_identity(source: MIDISource) -> Optional[Tuple]:
+    """
+    Cheap key identifying a MIDI source's contents without reading a file
+    
+    Paths are identified by the file's identity, size and modification
+    time; in-memory data by its SHA-256. File objects have no cheap
+    identity and give None.
+    """
+    if _is_midi_path(source):
+        st = os.stat(source)
+        return ("file", os.path.realpath(source), st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return ("sha256", hashlib.sha256(memoryview(source).cast('B')).hexdigest())
+    return None
+
+
+def _quote_form_param(value: str) -> str:
+    """
+    Escape a multipart header parameter the way browsers do (HTML5)
+    """
+    return value.replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+
+class _MultipartStream:
+    """
+    multipart/form-data request body that streams the file part from its source
+    
+    Only the small form-field preamble and the closing boundary are held in
+    memory; the file is read in whatever block size the HTTP connection asks
+    for, so memory per upload stays bounded regardless of file size.
+    """
+    
+    def __init__(self, fields: Dict[str, str], file_field: str, filename: str,
+                 file_obj: BinaryIO, file_size: int, content_type: str = 'audio/midi'):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        
+        head = []
+        for name, value in fields.items():
+            head.append(
+                f'--{self.boundary}\r\n'
+                f'Content-Disposition: form-data; name="{_quote_form_param(name)}"\r\n\r\n'
+                f'{value}\r\n'
+            )
+        head.append(
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="{_quote_form_param(file_field)}"; '
+            f'filename="{_quote_form_param(filename)}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        )
+        self._head = ''.join(head).encode('utf-8')
+        self._tail = f'\r\n--{self.boundary}--\r\n'.encode('utf-8')
+        self._file = file_obj
+        self._file_start = file_obj.tell()
+        self._file_size = file_size
+        self._length = len(self._head) + file_size + len(self._tail)
+        self._position = 0
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """
+        Reposition the body (absolute offsets only), e.g. to resend it
+        """
+        if whence != os.SEEK_SET:
+            raise io.UnsupportedOperation("only absolute seeks are supported")
+        head_end = len(self._head)
+        file_offset = min(max(offset - head_end, 0), self._file_size)
+        self._file.seek(self._file_start + file_offset)
+        self._position = offset
+        return offset
+    
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(lambda: self.read(64 * 1024), b'')
+    
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._length - self._position
+        
+        out = []
+        while size > 0 and self._position < self._length:
+            position = self._position
+            head_end = len(self._head)
+            file_end = head_end + self._file_size
+            
+            if position < head_end:
+                chunk = self._head[position:position + size]
+            elif position < file_end:
+                chunk = self._file.read(min(size, file_end - position))
+                if not chunk:
+                    raise IOError("MIDI file shrank while it was being uploaded")
+            else:
+                offset = position - file_end
+                chunk = self._tail[offset:offset + size]
+            
+            out.append(chunk)
+            self._position += len(chunk)
+            size -= len(chunk)
+        
+        return b''.join(out)
+
+
+class GenerationFailedError(Exception):
+    """
+    Raised when a generation job finishes with status "failed"
+    """
+    
+    def __init__(self, status: Dict[str, Any]):
+        super().__init__(f"Generation failed: {status.get('error')}")
+        self.status = status
+
+
+class StatusCheckError(Exception):
+    """
+    Raised when a status request is answered with an error response
+    """
+    
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class PollingStrategy:
+    """
+    Decides how long wait_for_completion sleeps before each status check
+    """
+    
+    def delays(self, job_id: str) -> Iterator[float]:
+        """
+        Yield the seconds to sleep before each successive status check of a job
+        """
+        raise NotImplementedError
+    
+    def job_submitted(self, job_id: str, style: str, duration: int) -> None:
+        """
+        Called when a generation job is submitted through the uploader
+        """
+    
+    def job_finished(self, job_id: str, status: Dict[str, Any]) -> None:
+        """
+        Called with the final status once a waited-on job completes or fails
+        """
+
+
+class FixedPolling(PollingStrategy):
+    """
+    Check immediately, then every `interval` seconds (the original behaviour)
+    """
+    
+    def __init__(self, interval: float = 5):
+        self.interval = interval
+    
+    def delays(self, job_id: str) -> Iterator[float]:
+        yield 0.0
+        while True:
+            yield self.interval
+
+
+class ExponentialBackoffPolling(PollingStrategy):
+    """
+    Check immediately, then back off exponentially with jitter up to a maximum interval
+    """
+    
+    def __init__(self, initial: float = 1.0, multiplier: float = 2.0,
+                 max_interval: float = 30.0, jitter: float = 0.1):
+        """
+        Args:
+            initial: First interval between status checks in seconds
+            multiplier: Factor the interval grows by after each check
+            max_interval: Upper bound on the interval in seconds
+            jitter: Random spread applied to each interval, as a fraction of it,
+                so jobs submitted together do not poll in lockstep
+        """
+        self.initial = initial
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.jitter = jitter
+    
+    def _backoff(self) -> Iterator[float]:
+        interval = self.initial
+        while True:
+            yield interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            interval = min(interval * self.multiplier, self.max_interval)
+    
+    def delays(self, job_id: str) -> Iterator[float]:
+        yield 0.0
+        yield from self._backoff()
+
+
+class AdaptivePolling(ExponentialBackoffPolling):
+    """
+    Learns how long jobs take per (style, duration) and sleeps until just before
+    the expected finish time before the first check, then backs off exponentially
+    
+    Only jobs submitted through the uploader this strategy is attached to are
+    learned from; other jobs are polled with plain exponential backoff.
+    """
+    
+    def __init__(self, initial: float = 1.0, multiplier: float = 1.5,
+                 max_interval: float = 30.0, jitter: float = 0.1,
+                 smoothing: float = 0.2, lead: float = 0.9, max_tracked_jobs: int = 100000):
+        """
+        Args:
+            initial: Interval after the first check in seconds
+            multiplier: Factor the interval grows by after each check
+            max_interval: Upper bound on the interval in seconds
+            jitter: Random spread applied to each interval, as a fraction of it
+            smoothing: Weight of the newest job in the moving average of durations
+            lead: First check happens at this fraction of the expected duration
+            max_tracked_jobs: Oldest submitted jobs beyond this are forgotten
+        """
+        super().__init__(initial, multiplier, max_interval, jitter)
+        self.smoothing = smoothing
+        self.lead = lead
+        self.max_tracked_jobs = max_tracked_jobs
+        self._lock = threading.Lock()
+        self._expected: Dict[Tuple[str, int], float] = {}
+        self._submitted: "OrderedDict[str, Tuple[Tuple[str, int], float]]" = OrderedDict()
+    
+    def expected_duration(self, style: str, duration: int) -> Optional[float]:
+        """
+        Learned average seconds from submission to completion, or None if unknown
+        """
+        with self._lock:
+            return self._expected.get((style, duration))
+    
+    def job_submitted(self, job_id: str, style: str, duration: int) -> None:
+        with self._lock:
+            self._submitted[job_id] = ((style, duration), time.monotonic())
+            while len(self._submitted) > self.max_tracked_jobs:
+                self._submitted.popitem(last=False)
+    
+    def job_finished(self, job_id: str, status: Dict[str, Any]) -> None:
+        with self._lock:
+            submitted = self._submitted.pop(job_id, None)
+            if submitted is None or status.get('status') != 'completed':
+                return
+            key, submitted_at = submitted
+            elapsed = time.monotonic() - submitted_at
+            previous = self._expected.get(key)
+            if previous is None:
+                self._expected[key] = elapsed
+            else:
+                self._expected[key] = previous + self.smoothing * (elapsed - previous)
+    
+    def delays(self, job_id: str) -> Iterator[float]:
+        with self._lock:
+            submitted = self._submitted.get(job_id)
+            expected = self._expected.get(submitted[0]) if submitted else None
+        
+        if expected is None:
+            yield 0.0
+        else:
+            yield max(0.0, expected * self.lead - (time.monotonic() - submitted[1]))
+        yield from self._backoff()
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    """
+    Accepts POSTed job status callbacks for a WebhookReceiver
+    """
+    
+    def do_POST(self) -> None:
+        receiver = self.server.receiver
+        url = urlsplit(self.path)
+        if url.path != receiver.path:
+            self.send_error(404)
+            return
+        if receiver.token is not None and parse_qs(url.query).get('token') != [receiver.token]:
+            self.send_error(403)
+            return
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            status = json.loads(self.rfile.read(length))
+        except (ValueError, json.JSONDecodeError):
+            self.send_error(400)
+            return
+        if not isinstance(status, dict) or not status.get('job_id'):
+            self.send_error(400)
+            return
+        
+        receiver.deliver(status)
+        self.send_response(204)
+        self.end_headers()
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class WebhookReceiver:
+    """
+    Small embedded HTTP server that receives generation completion callbacks
+    
+    When passed to SunoMIDIUploader, generate requests carry a callback_url
+    pointing here and wait_for_completion, JobWatcher and iter_completed wait
+    for the pushed status instead of polling. The callback body is expected
+    to be the same JSON that GET /generations/{job_id} returns. A slow
+    fallback poll still runs in case a callback is lost.
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: str = "/suno/callback",
+                 public_url: Optional[str] = None, token: Optional[str] = None,
+                 fallback_interval: float = 60.0, max_unclaimed: int = 100000):
+        """
+        Start the receiver in a background thread
+        
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            path: URL path callbacks are POSTed to
+            public_url: Externally reachable URL for the callback endpoint, if
+                the server is behind a proxy or NAT (default: built from host,
+                port and path)
+            token: Shared secret added to the callback URL as ?token= and
+                required on every callback (default: a random token)
+            fallback_interval: Seconds between safety polls while waiting
+            max_unclaimed: Resolved statuses nobody waited for beyond this are dropped
+        """
+        self.path = path
+        self.token = token if token is not None else uuid.uuid4().hex
+        self.fallback_interval = fallback_interval
+        self.max_unclaimed = max_unclaimed
+        self._lock = threading.Lock()
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+        
+        self._server = ThreadingHTTPServer((host, port), _WebhookHandler)
+        self._server.daemon_threads = True
+        self._server.receiver = self
+        self.port = self._server.server_address[1]
+        base_url = public_url or f"http://{host}:{self.port}{path}"
+        self.callback_url = f"{base_url}?token={self.token}"
+        
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="suno-webhook", daemon=True)
+        self._thread.start()
+    
+    def expect(self, job_id: str) -> Future:
+        """
+        Return the future that resolves when the callback for a job arrives
+        
+        The future resolves to the final status on "completed", or raises
+        GenerationFailedError on "failed".
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+            if future is None:
+                future = self._futures[job_id] = Future()
+                self._trim()
+            return future
+    
+    def is_expected(self, job_id: str) -> bool:
+        """
+        Whether a callback for the job is awaited or has already arrived
+        """
+        with self._lock:
+            return job_id in self._futures
+    
+    def discard(self, job_id: str) -> None:
+        """
+        Forget a job once its result has been consumed
+        """
+        with self._lock:
+            self._futures.pop(job_id, None)
+    
+    def deliver(self, status: Dict[str, Any]) -> None:
+        """
+        Resolve a job's future from a callback body (non-final statuses are ignored)
+        """
+        state = status.get('status')
+        if state not in ('completed', 'failed'):
+            return
+        
+        future = self.expect(status['job_id'])
+        if future.done():
+            return
+        try:
+            if state == 'completed':
+                future.set_result(status)
+            else:
+                future.set_exception(GenerationFailedError(status))
+        except Exception:
+            # Resolved concurrently by a duplicate callback
+            pass
+    
+    def _trim(self) -> None:
+        # Caller holds self._lock
+        if len(self._futures) <= self.max_unclaimed:
+            return
+        for job_id in [job_id for job_id, future in self._futures.items() if future.done()]:
+            del self._futures[job_id]
+            if len(self._futures) <= self.max_unclaimed:
+                break
+    
+    def close(self) -> None:
+        """
+        Stop the HTTP server
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+    
+    def __enter__(self) -> "WebhookReceiver":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a Deadline's budget runs out
+    """
+
+
+class Deadline:
+    """
+    One overall time budget carried through a chain of calls, e.g.
+    generate_from_midi -> wait_for_completion -> download_result
+    
+    Each request's connect and read timeouts are clipped to what is left of
+    the budget, so the whole chain finishes or fails within it.
+    """
+    
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds: Total budget, starting now
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+    
+    def remaining(self) -> float:
+        """
+        Seconds left (never negative)
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+    
+    def check(self) -> None:
+        """
+        Raise DeadlineExceeded if the budget is used up
+        """
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline of {self.seconds} seconds exceeded")
+    
+    def timeout(self, connect: float, read: float) -> Tuple[float, float]:
+        """
+        (connect, read) timeouts for the next request, clipped to the remaining budget
+        """
+        self.check()
+        remaining = self.remaining()
+        return min(connect, remaining), min(read, remaining)
+    
+    def sleep(self, seconds: float) -> None:
+        """
+        Sleep, or raise DeadlineExceeded if the budget would run out first
+        """
+        if seconds >= self.remaining():
+            raise DeadlineExceeded(f"Deadline of {self.seconds} seconds exceeded")
+        time.sleep(seconds)
+
+
+class RateLimitError(Exception):
+    """
+    Raised when the API still answers 429 after the allowed retries
+    """
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with a separate budget per endpoint
+    
+    Endpoints used by SunoMIDIUploader are "upload", "generate", "status" and
+    "download". Share one instance between every client in the process so
+    they draw from the same budgets. Besides the local budgets, the limiter
+    pauses an endpoint when the server sends Retry-After or reports that its
+    rate-limit window is used up.
+    """
+    
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Args:
+            budgets: Maps endpoint name to (requests per second, burst size).
+                Endpoints without a budget are not limited locally but still
+                honour server back-off signals.
+        """
+        self.budgets = dict(budgets or {})
+        self._lock = threading.Lock()
+        self._states: Dict[str, List[float]] = {}
+    
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            yield
+    
+    def _read_state(self, endpoint: str) -> List[float]:
+        """
+        [tokens, last update time, paused until] for an endpoint (lock held)
+        """
+        state = self._states.get(endpoint)
+        if state is None:
+            burst = self.budgets.get(endpoint, (0.0, 1.0))[1]
+            state = [float(burst), time.time(), 0.0]
+        return state
+    
+    def _write_state(self, endpoint: str, state: List[float]) -> None:
+        self._states[endpoint] = state
+    
+    def acquire(self, endpoint: str, timeout: Optional[float] = None) -> float:
+        """
+        Block until the endpoint may be called
+        
+        Args:
+            endpoint: Endpoint name
+            timeout: Maximum seconds to wait (default: no limit)
+            
+        Returns:
+            Seconds spent waiting
+            
+        Raises:
+            TimeoutError: If the endpoint cannot be called within timeout
+        """
+        budget = self.budgets.get(endpoint)
+        waited = 0.0
+        while True:
+            with self._locked():
+                tokens, updated, paused_until = self._read_state(endpoint)
+                now = time.time()
+                if budget is None:
+                    if now >= paused_until:
+                        return waited
+                    delay = paused_until - now
+                else:
+                    rate, burst = budget
+                    tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+                    if now >= paused_until and tokens >= 1:
+                        self._write_state(endpoint, [tokens - 1, now, paused_until])
+                        return waited
+                    self._write_state(endpoint, [tokens, now, paused_until])
+                    delay = max(paused_until - now, (1 - tokens) / rate)
+            if timeout is not None and waited + delay > timeout:
+                raise TimeoutError(f"Rate limit for {endpoint} not available within {timeout} seconds")
+            time.sleep(delay)
+            waited += delay
+    
+    def pause(self, endpoint: str, seconds: float) -> None:
+        """
+        Stop all calls to an endpoint for the given number of seconds
+        """
+        with self._locked():
+            paused_until = self._read_state(endpoint)[2]
+            now = time.time()
+            self._write_state(endpoint, [0.0, now, max(paused_until, now + seconds)])
+    
+    def update_from_headers(self, endpoint: str, headers: Dict[str, str]) -> None:
+        """
+        Apply Retry-After and X-RateLimit-Remaining / X-RateLimit-Reset headers
+        """
+        retry_after = _retry_after_seconds(headers.get('Retry-After'))
+        if retry_after is not None:
+            self.pause(endpoint, retry_after)
+            return
+        
+        remaining = headers.get('X-RateLimit-Remaining', headers.get('RateLimit-Remaining'))
+        reset = headers.get('X-RateLimit-Reset', headers.get('RateLimit-Reset'))
+        try:
+            remaining = int(remaining) if remaining is not None else None
+            reset = float(reset) if reset is not None else None
+        except ValueError:
+            return
+        
+        if remaining is not None and remaining <= 0 and reset is not None:
+            # Reset is either an epoch timestamp or seconds from now
+            self.pause(endpoint, reset - time.time() if reset > 1e9 else reset)
+        elif remaining is not None:
+            with self._locked():
+                state = self._read_state(endpoint)
+                state[0] = min(state[0], float(remaining))
+                self._write_state(endpoint, state)
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    RateLimiter whose buckets live in a memory-mapped file shared by every
+    process on the host, so workers using the same API key split one quota
+    
+    Every process must open the same path with the same budgets and endpoints.
+    """
+    
+    _MAGIC = b'SUNORL01'
+    _HEADER = struct.Struct('<8sI')
+    _SLOT = struct.Struct('<ddd')
+    
+    def __init__(self, path: str, budgets: Optional[Dict[str, Tuple[float, float]]] = None,
+                 endpoints: Iterable[str] = ("upload", "generate", "status", "download")):
+        """
+        Args:
+            path: File holding the shared bucket state (created if missing)
+            budgets: Maps endpoint name to (requests per second, burst size)
+                for the whole host
+            endpoints: Endpoints whose state is shared, in addition to those
+                with a budget
+        """
+        super().__init__(budgets)
+        names = sorted(set(endpoints) | set(self.budgets))
+        self._slots = {name: index for index, name in enumerate(names)}
+        size = self._HEADER.size + len(names) * self._SLOT.size
+        
+        self._file = open(path, 'a+b')
+        with self._file_lock():
+            if os.fstat(self._file.fileno()).st_size == 0:
+                now = time.time()
+                self._file.write(self._HEADER.pack(self._MAGIC, len(names)))
+                for name in names:
+                    burst = self.budgets.get(name, (0.0, 1.0))[1]
+                    self._file.write(self._SLOT.pack(float(burst), now, 0.0))
+                self._file.flush()
+            
+            self._file.seek(0)
+            magic, count = self._HEADER.unpack(self._file.read(self._HEADER.size))
+        
+        if magic != self._MAGIC or count != len(names):
+            self._file.close()
+            raise ValueError(f"{path} was created with a different rate limiter layout")
+        
+        self._map = mmap.mmap(self._file.fileno(), size)
+    
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        fileno = self._file.fileno()
+        if fcntl is not None:
+            fcntl.flock(fileno, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fileno, fcntl.LOCK_UN)
+        else:
+            os.lseek(fileno, 0, os.SEEK_SET)
+            msvcrt.locking(fileno, msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                os.lseek(fileno, 0, os.SEEK_SET)
+                msvcrt.locking(fileno, msvcrt.LK_UNLCK, 1)
+    
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # The thread lock serialises threads; the file lock serialises processes
+        with self._lock, self._file_lock():
+            yield
+    
+    def _offset(self, endpoint: str) -> Optional[int]:
+        index = self._slots.get(endpoint)
+        if index is None:
+            return None
+        return self._HEADER.size + index * self._SLOT.size
+    
+    def _read_state(self, endpoint: str) -> List[float]:
+        offset = self._offset(endpoint)
+        if offset is None:
+            return super()._read_state(endpoint)
+        return list(self._SLOT.unpack_from(self._map, offset))
+    
+    def _write_state(self, endpoint: str, state: List[float]) -> None:
+        offset = self._offset(endpoint)
+        if offset is None:
+            super()._write_state(endpoint, state)
+        else:
+            self._SLOT.pack_into(self._map, offset, *state)
+    
+    def close(self) -> None:
+        """
+        Unmap and close the shared state file
+        """
+        with self._lock:
+            self._map.close()
+            self._file.close()
+
+
+class RetryPolicy:
+    """
+    Which failed requests SunoMIDIUploader retries, and how long it waits between attempts
+    
+    Connection errors, timeouts and the listed 5xx statuses are retried with
+    exponential backoff. Upload and generate requests carry an
+    Idempotency-Key header that stays the same across attempts, so the
+    server can recognise a resend and not create (or bill) a second job.
+    """
+    
+    def __init__(self, max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 10.0,
+                 jitter: float = 0.1, retry_statuses: Iterable[int] = (500, 502, 503, 504)):
+        """
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff: Delay before the first retry in seconds; doubles each retry
+            max_backoff: Upper bound on the delay in seconds
+            jitter: Random spread applied to each delay, as a fraction of it
+            retry_statuses: HTTP statuses that are retried
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+    
+    def delay(self, retry: int) -> float:
+        """
+        Seconds to wait before the given retry (1 for the first)
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (retry - 1))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised without sending anything while an endpoint's circuit is open
+    """
+    
+    def __init__(self, message: str, endpoint: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker that stops calls to an endpoint which keeps failing
+    
+    Each endpoint starts closed. After failure_threshold consecutive failures
+    (connection errors, timeouts or 5xx responses) it opens, and every call
+    fails at once with CircuitOpenError. Once recovery_timeout has passed it
+    is half-open: up to half_open_max_calls trial calls go through, and
+    success_threshold successes close it again while any failure re-opens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, success_threshold: int = 1):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before trial calls
+            half_open_max_calls: Trial calls allowed in flight while half-open
+            success_threshold: Successful trial calls needed to close the circuit
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self._lock = threading.Lock()
+        # endpoint -> [state, consecutive failures, opened_at, trials in flight, trial successes]
+        self._circuits: Dict[str, list] = {}
+    
+    def _circuit(self, endpoint: str) -> list:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = [self.CLOSED, 0, 0.0, 0, 0]
+        if circuit[0] == self.OPEN and time.monotonic() - circuit[2] >= self.recovery_timeout:
+            circuit[0] = self.HALF_OPEN
+            circuit[3] = circuit[4] = 0
+        return circuit
+    
+    def state(self, endpoint: str) -> str:
+        """
+        Current state of the endpoint's circuit: "closed", "open" or "half_open"
+        """
+        with self._lock:
+            return self._circuit(endpoint)[0]
+    
+    def before_call(self, endpoint: str) -> None:
+        """
+        Claim permission to call the endpoint
+        
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all
+                trial calls already in flight
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit[0] == self.CLOSED:
+                return
+            if circuit[0] == self.HALF_OPEN and circuit[3] < self.half_open_max_calls:
+                circuit[3] += 1
+                return
+            retry_after = max(0.0, circuit[2] + self.recovery_timeout - time.monotonic())
+        raise CircuitOpenError(f"Circuit for {endpoint} is open", endpoint, retry_after)
+    
+    def record_success(self, endpoint: str) -> None:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit[0] == self.OPEN:
+                # A call that started before the circuit opened
+                return
+            if circuit[0] == self.HALF_OPEN:
+                circuit[3] = max(0, circuit[3] - 1)
+                circuit[4] += 1
+                if circuit[4] < self.success_threshold:
+                    return
+            circuit[0] = self.CLOSED
+            circuit[1] = 0
+    
+    def record_failure(self, endpoint: str) -> None:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit[1] += 1
+            if circuit[0] == self.HALF_OPEN or circuit[1] >= self.failure_threshold:
+                circuit[0] = self.OPEN
+                circuit[2] = time.monotonic()
+    
+    def cancel(self, endpoint: str) -> None:
+        """
+        Give back a claimed call that ended without reaching the server
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit[0] == self.HALF_OPEN:
+                circuit[3] = max(0, circuit[3] - 1)
+
+
+class AIMDConcurrencyController:
+    """
+    Adapts how many calls may be in flight at once, the way TCP congestion
+    control adapts its window
+    
+    While latency stays near its healthy baseline the limit grows additively
+    (by `increase` per limit's worth of completed calls); a 429, a 5xx, a
+    connection error or a latency spike cuts it multiplicatively. Latency
+    is tracked per endpoint, so a slow multi-MB upload is only compared
+    with other uploads and never reads as a spike next to a small generate
+    request.
+    """
+    
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64,
+                 increase: float = 1.0, decrease: float = 0.5,
+                 latency_tolerance: float = 2.0, baseline_window: float = 30.0):
+        """
+        Args:
+            initial: Starting concurrency limit
+            minimum: Limit never drops below this
+            maximum: Limit never grows above this
+            increase: Additive growth per limit's worth of healthy calls
+            decrease: Factor the limit is multiplied by on overload
+            latency_tolerance: Recent latency above this multiple of the
+                baseline (the fastest call to the same endpoint over
+                baseline_window seconds) counts as overload
+            baseline_window: Seconds of history the baseline latency covers
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.baseline_window = baseline_window
+        self._limit = float(initial)
+        self._inflight = 0
+        # endpoint -> [recent latency, current bucket min, previous bucket min, bucket start]
+        self._latencies: Dict[str, list] = {}
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+    
+    @property
+    def limit(self) -> int:
+        """
+        Current number of calls allowed in flight
+        """
+        with self._cond:
+            return int(self._limit)
+    
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until a call may start
+        
+        Raises:
+            TimeoutError: If no slot frees up within timeout seconds
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._inflight < int(self._limit), timeout):
+                raise TimeoutError(f"No concurrency slot free within {timeout} seconds")
+            self._inflight += 1
+    
+    def _baseline(self, latencies: list) -> Optional[float]:
+        """
+        Lowest latency seen on an endpoint over roughly the last baseline_window seconds
+        """
+        candidates = [m for m in latencies[1:3] if m is not None]
+        return min(candidates) if candidates else None
+    
+    def _observe_baseline(self, latencies: list, latency: float, now: float) -> None:
+        # Two half-window buckets approximate a sliding-window minimum cheaply
+        if now - latencies[3] >= self.baseline_window / 2:
+            latencies[2], latencies[1] = latencies[1], None
+            latencies[3] = now
+        if latencies[1] is None or latency < latencies[1]:
+            latencies[1] = latency
+    
+    def release(self, latency: float, overloaded: bool = False,
+                endpoint: str = "default") -> None:
+        """
+        Report a finished call and adjust the limit
+        
+        Args:
+            latency: Seconds the call took
+            overloaded: The server signalled overload (429, 5xx, connection error)
+            endpoint: Endpoint called; latency is compared only with the
+                same endpoint's baseline
+        """
+        with self._cond:
+            self._inflight -= 1
+            now = time.monotonic()
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = [None, None, None, now]
+            
+            # Judge spikes on a short moving average so one slow call is not enough
+            if latencies[0] is None:
+                latencies[0] = latency
+            else:
+                latencies[0] += 0.3 * (latency - latencies[0])
+            recent = latencies[0]
+            baseline = self._baseline(latencies)
+            spike = baseline is not None and recent > baseline * self.latency_tolerance
+            
+            if overloaded or spike:
+                # Calls already in flight saw the same congestion; cut once per round trip
+                cooldown = recent
+                if now - self._last_decrease >= cooldown:
+                    self._limit = max(float(self.minimum), self._limit * self.decrease)
+                    self._last_decrease = now
+            else:
+                self._limit = min(float(self.maximum), self._limit + self.increase / self._limit)
+            
+            if not overloaded:
+                self._observe_baseline(latencies, latency, now)
+            self._cond.notify_all()
+    
+    def cancel(self) -> None:
+        """
+        Give back a slot whose call was never sent, without adjusting the limit
+        """
+        with self._cond:
+            self._inflight -= 1
+            self._cond.notify_all()
+
+
+class _SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one
+    
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait for it and receive a deep copy of its result (or
+    the same exception), so no caller sees another's changes to it.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Any, Future] = {}
+    
+    def do(self, key: Any, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run fn, or wait for the in-flight call with the same key
+        
+        Args:
+            key: Hashable identity of the call
+            fn: Function doing the work
+            timeout: Maximum seconds a waiting caller waits (default: no limit)
+            
+        Returns:
+            fn's result
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        
+        if not leader:
+            return copy.deepcopy(future.result(timeout))
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+
+class MIDIUploadCache:
+    """
+    Persistent SQLite cache from MIDI content hash to uploaded midi_id
+    
+    Use one cache file per Suno account; midi_ids are not shared between accounts.
+    """
+    
+    def __init__(self, path: str = "suno_midi_cache.sqlite3", ttl: float = 24 * 3600,
+                 max_entries: int = 10000):
+        """
+        Open (or create) the cache
+        
+        Args:
+            path: SQLite database file
+            ttl: Seconds an uploaded midi_id is trusted before uploading again
+            max_entries: Least recently used entries beyond this are evicted
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                "digest TEXT PRIMARY KEY, midi_id TEXT NOT NULL, "
+                "created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS uploads_last_used ON uploads (last_used)"
+            )
+    
+    def get(self, digest: str) -> Optional[str]:
+        """
+        Return the cached midi_id for a content hash, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT midi_id, created FROM uploads WHERE digest = ?", (digest,)
+            ).fetchone()
+            if row is None:
+                return None
+            midi_id, created = row
+            if now - created > self.ttl:
+                self._conn.execute("DELETE FROM uploads WHERE digest = ?", (digest,))
+                return None
+            self._conn.execute(
+                "UPDATE uploads SET last_used = ? WHERE digest = ?", (now, digest)
+            )
+            return midi_id
+    
+    def put(self, digest: str, midi_id: str) -> None:
+        """
+        Remember the midi_id for a content hash and evict old entries
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploads (digest, midi_id, created, last_used) "
+                "VALUES (?, ?, ?, ?)", (digest, midi_id, now, now)
+            )
+            self._conn.execute("DELETE FROM uploads WHERE created < ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM uploads WHERE digest IN ("
+                "SELECT digest FROM uploads ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+    
+    def close(self) -> None:
+        """
+        Close the database connection
+        """
+        with self._lock:
+            self._conn.close()
+
+
+class JobStatusCache:
+    """
+    Cache of final ("completed" or "failed") job statuses
+    
+    A finished job's status never changes, so once seen it can be answered
+    locally. Recent statuses are kept in memory; with a path, every status
+    is also written to a SQLite file so it survives restarts and can be
+    shared between processes.
+    """
+    
+    TERMINAL_STATUSES = frozenset(("completed", "failed"))
+    
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None,
+                 max_disk_entries: int = 100000):
+        """
+        Args:
+            max_entries: Statuses kept in memory; least recently used are evicted
+            path: Optional SQLite database file for the on-disk tier
+            max_disk_entries: Statuses kept on disk; oldest are evicted
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()
+        # job_id -> status as JSON, so every caller gets its own copy
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS statuses ("
+                    "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, stored REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS statuses_stored ON statuses (stored)"
+                )
+    
+    def _remember(self, job_id: str, encoded: str) -> None:
+        self._memory[job_id] = encoded
+        self._memory.move_to_end(job_id)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the final status of a job, or None if it is not cached
+        """
+        with self._lock:
+            encoded = self._memory.get(job_id)
+            if encoded is not None:
+                self._memory.move_to_end(job_id)
+            elif self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT status FROM statuses WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                encoded = row[0]
+                self._remember(job_id, encoded)
+            else:
+                return None
+        return json.loads(encoded)
+    
+    def put(self, job_id: str, status: Dict[str, Any]) -> bool:
+        """
+        Cache a job's status if it is final
+        
+        Returns:
+            True if the status was cached
+        """
+        if status.get('status') not in self.TERMINAL_STATUSES:
+            return False
+        encoded = json.dumps({k: v for k, v in status.items() if k != '_client'})
+        with self._lock:
+            self._remember(job_id, encoded)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO statuses (job_id, status, stored) "
+                        "VALUES (?, ?, ?)", (job_id, encoded, time.time())
+                    )
+                    self._conn.execute(
+                        "DELETE FROM statuses WHERE job_id IN ("
+                        "SELECT job_id FROM statuses ORDER BY stored DESC LIMIT -1 OFFSET ?)",
+                        (self.max_disk_entries,)
+                    )
+        return True
+    
+    def close(self) -> None:
+        """
+        Close the database connection, if any
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class JobJournal:
+    """
+    Durable SQLite journal of end-to-end jobs run by SunoMIDIUploader.run_job
+    
+    Each job moves through the stages in STAGES, and every transition is
+    committed before the next step starts. After a crash or restart,
+    SunoMIDIUploader.resume() finishes each job from the last recorded
+    stage. Because the generate request's Idempotency-Key is journaled
+    before the request is sent, a job that was submitted but whose
+    response was lost is not started (or billed) a second time.
+    
+    Several workers may share one journal file. Every job is leased to the
+    journal instance running it, which renews the lease in the background;
+    resume() only takes over jobs whose lease has lapsed (their worker
+    died) or that belonged to an earlier run of a worker with the same
+    owner name.
+    """
+    
+    STAGES = ("pending", "uploaded", "generating", "generated", "completed", "downloaded")
+    FAILED = "failed"
+    
+    _COLUMNS = ("id", "stage", "source", "output_path", "params", "midi_id",
+                "idempotency_key", "job_id", "audio_url", "error", "created", "updated",
+                "owner", "heartbeat")
+    
+    def __init__(self, path: str, owner: Optional[str] = None, lease: float = 60.0):
+        """
+        Open (or create) the journal
+        
+        Args:
+            path: SQLite database file
+            owner: Stable name of this worker (e.g. "render-3"). Give each
+                worker its own name and keep it across restarts, so a
+                restarted worker can resume its own jobs at once instead of
+                waiting for their lease to lapse (default: a random name)
+            lease: Seconds a job stays leased to its worker without a
+                heartbeat; heartbeats are sent every lease / 3 seconds
+        """
+        self.path = path
+        self.owner = owner or uuid.uuid4().hex
+        self.lease = lease
+        # Distinguishes this run of the worker from earlier runs under the same owner
+        self._session = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, stage TEXT NOT NULL, source TEXT, "
+                "output_path TEXT NOT NULL, params TEXT NOT NULL, midi_id TEXT, "
+                "idempotency_key TEXT, job_id TEXT, audio_url TEXT, error TEXT, "
+                "created REAL NOT NULL, updated REAL NOT NULL, "
+                "owner TEXT, session TEXT, heartbeat REAL)"
+            )
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("session", "TEXT"), ("heartbeat", "REAL")):
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS transitions ("
+                "id TEXT NOT NULL, stage TEXT NOT NULL, at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_stage ON jobs (stage)")
+        
+        self._closed = threading.Event()
+        self._heartbeat = threading.Thread(target=self._renew_leases,
+                                           name="suno-journal-heartbeat", daemon=True)
+        self._heartbeat.start()
+    
+    def _renew_leases(self) -> None:
+        while not self._closed.wait(self.lease / 3):
+            with self._lock:
+                if self._closed.is_set():
+                    return
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE jobs SET heartbeat = ? WHERE session = ? "
+                        "AND stage NOT IN ('downloaded', 'failed')",
+                        (time.time(), self._session)
+                    )
+    
+    def create(self, source: Optional[str], output_path: str,
+               params: Dict[str, Any]) -> str:
+        """
+        Record a new job in the "pending" stage, leased to this journal
+        
+        Args:
+            source: Path of the MIDI file, or None for in-memory data
+                (such a job can only be resumed once it has been uploaded)
+            output_path: Where the result will be saved
+            params: Generation parameters ("prompt", "style", "duration")
+            
+        Returns:
+            The journal entry ID
+        """
+        entry_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, stage, source, output_path, params, created, updated, "
+                "owner, session, heartbeat) VALUES (?, 'pending', ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry_id, source, output_path, json.dumps(params), now, now,
+                 self.owner, self._session, now)
+            )
+            self._conn.execute(
+                "INSERT INTO transitions (id, stage, at) VALUES (?, 'pending', ?)",
+                (entry_id, now)
+            )
+        return entry_id
+    
+    def advance(self, entry_id: str, stage: str, **fields: Any) -> None:
+        """
+        Move a job to a new stage, storing any of midi_id, idempotency_key,
+        job_id, audio_url or error alongside it
+        """
+        columns = {k: fields[k] for k in ("midi_id", "idempotency_key", "job_id",
+                                          "audio_url", "error") if k in fields}
+        assignments = "".join(f", {column} = ?" for column in columns)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET stage = ?, updated = ?, heartbeat = ?{assignments} WHERE id = ?",
+                (stage, now, now, *columns.values(), entry_id)
+            )
+            self._conn.execute(
+                "INSERT INTO transitions (id, stage, at) VALUES (?, ?, ?)",
+                (entry_id, stage, now)
+            )
+    
+    def _row_to_entry(self, row: tuple) -> Dict[str, Any]:
+        entry = dict(zip(self._COLUMNS, row))
+        entry["params"] = json.loads(entry["params"])
+        return entry
+    
+    def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a job's journal entry, or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?", (entry_id,)
+            ).fetchone()
+        return None if row is None else self._row_to_entry(row)
+    
+    def unfinished(self) -> List[Dict[str, Any]]:
+        """
+        Journal entries of every job neither downloaded nor failed, oldest
+        first, whoever is running them
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jobs "
+                "WHERE stage NOT IN ('downloaded', 'failed') ORDER BY created"
+            ).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+    
+    def claim_orphaned(self) -> List[Dict[str, Any]]:
+        """
+        Take over the unfinished jobs no live worker is running
+        
+        A job is orphaned when its lease has lapsed, or when it belongs to
+        an earlier run of this journal's owner. Claimed jobs are leased to
+        this journal, so no other worker can claim them too.
+        
+        Returns:
+            Journal entries of the claimed jobs, oldest first
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(self._COLUMNS)} FROM jobs "
+                    "WHERE stage NOT IN ('downloaded', 'failed') AND ("
+                    "heartbeat IS NULL OR heartbeat < ? "
+                    "OR (owner = ? AND session IS NOT ?)) ORDER BY created",
+                    (now - self.lease, self.owner, self._session)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE jobs SET owner = ?, session = ?, heartbeat = ? WHERE id = ?",
+                    [(self.owner, self._session, now, row[0]) for row in rows]
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        entries = [self._row_to_entry(row) for row in rows]
+        for entry in entries:
+            entry.update(owner=self.owner, heartbeat=now)
+        return entries
+    
+    def release(self, entry_id: str) -> None:
+        """
+        Give up the lease on a job this worker stopped running, so any
+        worker's resume() can take it over
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET session = NULL, heartbeat = NULL WHERE id = ? AND session = ?",
+                (entry_id, self._session)
+            )
+    
+    def close(self) -> None:
+        """
+        Stop renewing leases and close the database connection
+        """
+        self._closed.set()
+        self._heartbeat.join()
+        with self._lock:
+            self._conn.close()
 
 
 class SunoMIDIUploader:
     """
-    Suno AI API for uploading MIDI files and generating music
+    Suno AI API for uploading MIDI files and generating music
+    """
+    
+    def __init__(self, api_key: str, base_url: str = "https://api.suno.ai/v1",
+                 pool_connections: int = 10, pool_maxsize: int = 10,
+                 keep_alive: bool = True, upload_cache: Optional[MIDIUploadCache] = None,
+                 polling: Optional[PollingStrategy] = None,
+                 webhook: Optional[WebhookReceiver] = None,
+                 download_buffer_size: int = 1024 * 1024,
+                 rate_limiter: Optional[RateLimiter] = None, rate_limit_retries: int = 5,
+                 concurrency: Optional[AIMDConcurrencyController] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 connect_timeout: float = 5.0, read_timeout: float = 60.0,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 coalesce: bool = True, status_cache: Optional[JobStatusCache] = None,
+                 journal: Optional[JobJournal] = None):
+        """
+        Initialize the Suno MIDI uploader
+        
+        Args:
+            api_key: Your Suno API key
+            base_url: Base URL for Suno API (default: https://api.suno.ai/v1)
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum connections kept open to a single host;
+                threads beyond this wait for a free connection
+            keep_alive: Reuse connections between requests (default: True)
+            upload_cache: Optional MIDIUploadCache so generate_from_midi skips
+                uploading files whose contents were uploaded before
+            polling: Default PollingStrategy for wait_for_completion (default:
+                fixed poll_interval)
+            webhook: Optional WebhookReceiver; generate requests then ask Suno
+                to push completion to it instead of being polled
+            download_buffer_size: Bytes read from the socket per write when
+                downloading results
+            rate_limiter: RateLimiter to draw from; share one between clients
+                to keep the whole process under the quota, or use a
+                SharedRateLimiter to cover every process on the host
+                (default: a private limiter that only honours server back-off)
+            rate_limit_retries: Times a 429 response is retried after waiting
+                out its Retry-After before RateLimitError is raised
+            concurrency: Optional AIMDConcurrencyController bounding how many
+                upload and generate calls are in flight; thread pools such as
+                upload_many's max_workers then only act as a ceiling
+            retry_policy: RetryPolicy for connection errors, timeouts and 5xx
+                responses (default: RetryPolicy())
+            connect_timeout: Seconds to wait for a connection to be set up
+            read_timeout: Seconds to wait between bytes of a response; a
+                Deadline passed to a call clips both to its remaining budget
+            circuit_breaker: CircuitBreaker tracking each endpoint's health;
+                calls to an endpoint whose circuit is open raise
+                CircuitOpenError at once (default: CircuitBreaker())
+            coalesce: Let concurrent identical calls share one request:
+                get_generation_status for the same job, and upload_midi of
+                the same file or bytes with the same metadata. Every caller
+                gets its own copy of the result (or the same exception).
+            status_cache: JobStatusCache answering get_generation_status for
+                jobs already seen finished, without a request (default: an
+                in-memory JobStatusCache())
+            journal: Optional JobJournal recording each step of run_job so
+                resume() can finish interrupted jobs after a restart
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+        self._session_lock = threading.Lock()
+        self._session = self._create_session(pool_connections, pool_maxsize, keep_alive)
+        self.upload_cache = upload_cache
+        self.polling = polling
+        self.webhook = webhook
+        self.download_buffer_size = download_buffer_size
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.rate_limit_retries = rate_limit_retries
+        self.concurrency = concurrency
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._singleflight = _SingleFlight() if coalesce else None
+        self.status_cache = status_cache or JobStatusCache()
+        self.journal = journal
+    
+    def _create_session(self, pool_connections: int, pool_maxsize: int,
+                        keep_alive: bool) -> requests.Session:
+        """
+        Build the pooled session shared by every API call
+        """
+        session = requests.Session()
+        # Never store cookies so the session holds no per-request state and
+        # can be shared freely between threads.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=True)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+    
+    def _request(self, method: str, url: str, endpoint: str,
+                 idempotency_key: Optional[str] = None, deadline: Optional[Deadline] = None,
+                 **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session
+        
+        Requests wait for the rate limit of their endpoint ("upload",
+        "generate", "status" or "download"), 429 responses are retried once
+        the server's Retry-After has passed, and connection errors, timeouts
+        and 5xx responses are retried according to the retry policy. Upload and generate requests get an
+        Idempotency-Key header (idempotency_key, or a fresh random one).
+        Each attempt goes through the endpoint's circuit breaker, so once the
+        endpoint has failed repeatedly CircuitOpenError is raised instead.
+        
+        Every attempt uses the client's connect/read timeouts, clipped to
+        what is left of deadline; waits that would outlast the deadline
+        raise DeadlineExceeded instead.
+        
+        The returned response carries `retries` (how many times the request
+        was resent) and `idempotency_key` attributes.
+        """
+        session = self._session
+        if session is None:
+            raise RuntimeError("SunoMIDIUploader has been closed")
+        timeouts = (self.connect_timeout, self.read_timeout)
+        
+        if endpoint in ("upload", "generate"):
+            idempotency_key = idempotency_key or uuid.uuid4().hex
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), "Idempotency-Key": idempotency_key}
+        
+        sleep = deadline.sleep if deadline else time.sleep
+        breaker = self.circuit_breaker
+        policy = self.retry_policy
+        body = kwargs.get('data')
+        retries = 0
+        rate_limited = 0
+        while True:
+            if retries + rate_limited and hasattr(body, 'seek'):
+                body.seek(0)
+            kwargs['timeout'] = deadline.timeout(*timeouts) if deadline else timeouts
+            
+            breaker.before_call(endpoint)
+            try:
+                response = self._send(session, method, url, endpoint, deadline, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                breaker.record_failure(endpoint)
+                if deadline and deadline.expired:
+                    raise DeadlineExceeded(f"Deadline of {deadline.seconds} seconds exceeded")
+                if retries >= policy.max_retries:
+                    raise
+                retries += 1
+                sleep(policy.delay(retries))
+                continue
+            except BaseException:
+                breaker.cancel(endpoint)
+                raise
+            
+            if response.status_code >= 500:
+                breaker.record_failure(endpoint)
+            else:
+                breaker.record_success(endpoint)
+            
+            if response.status_code == 429:
+                retry_after = _retry_after_seconds(response.headers.get('Retry-After'))
+                response.close()
+                if rate_limited >= self.rate_limit_retries:
+                    raise RateLimitError(
+                        f"Rate limited on {endpoint} after {self.rate_limit_retries} retries",
+                        retry_after
+                    )
+                if retry_after is None:
+                    # No hint from the server: back off exponentially
+                    self.rate_limiter.pause(endpoint, min(60.0, 2.0 ** rate_limited))
+                rate_limited += 1
+                continue
+            
+            if response.status_code in policy.retry_statuses and retries < policy.max_retries:
+                response.close()
+                retries += 1
+                sleep(policy.delay(retries))
+                continue
+            
+            response.retries = retries + rate_limited
+            response.idempotency_key = idempotency_key
+            return response
+    
+    def _send(self, session: requests.Session, method: str, url: str, endpoint: str,
+              deadline: Optional[Deadline] = None, **kwargs) -> requests.Response:
+        """
+        Send one attempt under the rate limiter and, for upload/generate, the
+        concurrency controller
+        """
+        controller = self.concurrency if endpoint in ("upload", "generate") else None
+        if controller is None:
+            self._acquire_rate_limit(endpoint, deadline)
+            response = session.request(method, url, **kwargs)
+            self.rate_limiter.update_from_headers(endpoint, response.headers)
+            return response
+        
+        try:
+            controller.acquire(deadline.remaining() if deadline else None)
+        except TimeoutError:
+            raise DeadlineExceeded(f"Deadline of {deadline.seconds} seconds exceeded") from None
+        try:
+            self._acquire_rate_limit(endpoint, deadline)
+        except BaseException:
+            # Held back locally; the server said nothing about its load
+            controller.cancel()
+            raise
+        
+        overloaded = False
+        start = time.monotonic()
+        try:
+            response = session.request(method, url, **kwargs)
+            self.rate_limiter.update_from_headers(endpoint, response.headers)
+            overloaded = response.status_code == 429 or response.status_code >= 500
+            return response
+        except (requests.ConnectionError, requests.Timeout):
+            overloaded = True
+            raise
+        finally:
+            controller.release(time.monotonic() - start, overloaded, endpoint)
+    
+    def _acquire_rate_limit(self, endpoint: str, deadline: Optional[Deadline]) -> None:
+        """
+        Wait for the rate limiter, but no longer than the deadline allows
+        """
+        if deadline is None:
+            self.rate_limiter.acquire(endpoint)
+            return
+        try:
+            self.rate_limiter.acquire(endpoint, timeout=deadline.remaining())
+        except TimeoutError:
+            raise DeadlineExceeded(f"Deadline of {deadline.seconds} seconds exceeded") from None
+    
+    @staticmethod
+    def _json_with_client_metadata(response: requests.Response) -> Dict[str, Any]:
+        """
+        Decode a JSON response and attach what the client did to obtain it
+        """
+        result = response.json()
+        if isinstance(result, dict):
+            result['_client'] = {
+                "retries": getattr(response, 'retries', 0),
+                "idempotency_key": getattr(response, 'idempotency_key', None)
+            }
+        return result
+    
+    def _coalesce(self, key: Any, fn: Callable[[], Any], deadline: Optional[Deadline]) -> Any:
+        """
+        Run fn through the singleflight group, waiting no longer than the deadline
+        
+        The shared call runs under its first caller's deadline. If that runs
+        out, callers that were only waiting on it and still have time left
+        try again instead of failing with it.
+        """
+        ran = []
+        
+        def run() -> Any:
+            ran.append(True)
+            return fn()
+        
+        while True:
+            try:
+                return self._singleflight.do(key, run, deadline.remaining() if deadline else None)
+            except DeadlineExceeded:
+                if ran or (deadline is not None and deadline.expired):
+                    raise
+            except FutureTimeoutError:
+                if deadline is None:
+                    raise
+                # Gave up waiting on another caller's request
+                raise DeadlineExceeded(f"Deadline of {deadline.seconds} seconds exceeded") from None
+    
+    def close(self) -> None:
+        """
+        Close the connection pool. The uploader cannot be used afterwards.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+    
+    def __enter__(self) -> "SunoMIDIUploader":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def upload_midi(self, midi_path: MIDISource, title: Optional[str] = None, 
+                   style: Optional[str] = None, tags: Optional[list] = None,
+                   filename: Optional[str] = None, validate: bool = True,
+                   idempotency_key: Optional[str] = None,
+                   deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Upload a MIDI file to Suno AI
+        
+        Args:
+            midi_path: Path to the MIDI file, or its contents as bytes,
+                a memoryview or a binary file object
+            title: Optional title for the generated music
+            style: Optional music style/genre
+            tags: Optional list of tags
+            filename: Filename to upload under (defaults to the file's own
+                name, or "upload.mid" for in-memory data)
+            validate: Check the MIDI header and chunk lengths locally first,
+                so corrupt files fail before anything is sent
+            idempotency_key: Key that makes retries of this upload safe
+                (default: a new random key)
+            deadline: Optional Deadline bounding the whole call, retries included
+            
+        Returns:
+            Dict containing upload response with job_id, plus "_client"
+            with the "retries" needed and the "idempotency_key" used
+        """
+        upload_name = _midi_upload_name(midi_path, filename)
+        
+        data = {}
+        if title:
+            data['title'] = title
+        if style:
+            data['style'] = style
+        if tags:
+            data['tags'] = json.dumps(tags)
+        
+        return self._upload_midi(midi_path, upload_name, data, validate,
+                                 idempotency_key, deadline)
+    
+    def _upload_midi(self, midi_path: MIDISource, upload_name: str, data: Dict[str, str],
+                     validate: bool, idempotency_key: Optional[str],
+                     deadline: Optional[Deadline], digest: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Upload a MIDI source, sharing the request with concurrent identical uploads
+        
+        Uploads are identical when they carry the same metadata and the
+        same content: the same SHA-256 digest if the caller already has
+        one, else the same unchanged file on disk or the same in-memory
+        bytes. File objects are only coalesced when a digest is given.
+        """
+        def upload() -> Dict[str, Any]:
+            return self._post_midi(midi_path, upload_name, data, validate,
+                                   idempotency_key, deadline)
+        
+        if self._singleflight is None:
+            return upload()
+        identity = ("sha256", digest) if digest is not None else _midi_identity(midi_path)
+        if identity is None:
+            return upload()
+        key = ("upload", identity, upload_name, tuple(sorted(data.items())), validate, idempotency_key)
+        return self._coalesce(key, upload, deadline)
+    
+    def _post_midi(self, midi_path: MIDISource, upload_name: str, data: Dict[str, str],
+                   validate: bool, idempotency_key: Optional[str],
+                   deadline: Optional[Deadline]) -> Dict[str, Any]:
+        """
+        Send one upload request for a MIDI source
+        """
+        # Upload endpoint
+        upload_url = f"{self.base_url}/uploads/midi"
+        
+        # Stream the file into the multipart body instead of reading it whole
+        with _open_midi_source(midi_path) as (f, size):
+            if validate:
+                validate_midi(f)
+            body = _MultipartStream(data, 'midi_file', upload_name, f, size)
+            upload_headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": body.content_type
+            }
+            
+            response = self._request(
+                "POST",
+                upload_url,
+                endpoint="upload",
+                idempotency_key=idempotency_key,
+                deadline=deadline,
+                headers=upload_headers,
+                data=body
+            )
+        
+        if response.status_code != 200:
+            raise Exception(f"Upload failed: {response.status_code} - {response.text}")
+        
+        return self._json_with_client_metadata(response)
+    
+    def upload_many(self, paths: Iterable[MIDISource], max_workers: int = 8,
+                    max_inflight_bytes: int = 64 * 1024 * 1024,
+                    title: Optional[str] = None, style: Optional[str] = None,
+                    tags: Optional[list] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Upload many MIDI files concurrently, yielding each result as it finishes
+        
+        Results come back in completion order, not input order. A failed
+        upload is reported in its result instead of stopping the batch.
+        
+        Args:
+            paths: MIDI sources accepted by upload_midi (may be a lazy iterable)
+            max_workers: Maximum uploads running at once
+            max_inflight_bytes: Upper bound on the combined size of the files
+                being uploaded at once. A single file larger than the budget
+                is still uploaded, but on its own.
+            title: Optional title applied to every upload
+            style: Optional music style/genre applied to every upload
+            tags: Optional list of tags applied to every upload
+            
+        Yields:
+            Dict with "path" (the source), "result" (the upload response, or None) and
+            "error" (the raised exception, or None)
+        """
+        path_iter = iter(paths)
+        pending = {}
+        inflight_bytes = 0
+        queued = None
+        exhausted = False
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while True:
+                while not exhausted and len(pending) < max_workers:
+                    if queued is None:
+                        try:
+                            path = next(path_iter)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        queued = (path, _midi_source_size(path))
+                    
+                    path, size = queued
+                    if pending and inflight_bytes + size > max_inflight_bytes:
+                        break
+                    
+                    future = executor.submit(self.upload_midi, path, title, style, tags)
+                    pending[future] = queued
+                    inflight_bytes += size
+                    queued = None
+                
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, size = pending.pop(future)
+                    inflight_bytes -= size
+                    error = future.exception()
+                    yield {
+                        "path": path,
+                        "result": None if error else future.result(),
+                        "error": error
+                    }
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def generate_from_midi(self, midi_path: MIDISource, prompt: Optional[str] = None,
+                          style: str = "pop", duration: int = 180,
+                          deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Generate music from MIDI file with additional parameters
+        
+        Args:
+            midi_path: Path to the MIDI file, or any source accepted by upload_midi
+            prompt: Text prompt to guide generation
+            style: Music style (pop, rock, jazz, classical, etc.)
+            duration: Target duration in seconds
+            deadline: Optional Deadline shared by the upload and generate
+                requests; pass the same one on to wait_for_completion and
+                download_result to bound the whole job
+            
+        Returns:
+            Dict containing generation job details
+        """
+        # First upload the MIDI (or reuse an earlier upload of the same bytes)
+        midi_id = self._upload_for_generation(midi_path, deadline)
+        
+        return self.generate_from_midi_id(midi_id, prompt=prompt, style=style,
+                                          duration=duration, deadline=deadline)
+    
+    def generate_from_midi_id(self, midi_id: str, prompt: Optional[str] = None,
+                              style: str = "pop", duration: int = 180,
+                              idempotency_key: Optional[str] = None,
+                              deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Generate music from a MIDI file that has already been uploaded
+        
+        Args:
+            midi_id: The midi_id returned from upload_midi
+            prompt: Text prompt to guide generation
+            style: Music style (pop, rock, jazz, classical, etc.)
+            duration: Target duration in seconds
+            idempotency_key: Key that makes retries of this request safe, so
+                a resend never starts (or bills) a second job (default: a
+                new random key)
+            deadline: Optional Deadline bounding the whole call, retries included
+            
+        Returns:
+            Dict containing generation job details, plus "_client" with the
+            "retries" needed and the "idempotency_key" used
+        """
+        generate_url = f"{self.base_url}/generate"
+        
+        payload = {
+            "midi_id": midi_id,
+            "style": style,
+            "duration": duration
+        }
+        
+        if prompt:
+            payload["prompt"] = prompt
+        
+        if self.webhook is not None:
+            payload["callback_url"] = self.webhook.callback_url
+        
+        response = self._request(
+            "POST",
+            generate_url,
+            endpoint="generate",
+            idempotency_key=idempotency_key,
+            deadline=deadline,
+            headers=self.headers,
+            json=payload
+        )
+        
+        if response.status_code != 200:
+            raise Exception(f"Generation failed: {response.status_code} - {response.text}")
+        
+        result = self._json_with_client_metadata(response)
+        if self.polling is not None and result.get('job_id'):
+            self.polling.job_submitted(result['job_id'], style, duration)
+        if self.webhook is not None and result.get('job_id'):
+            self.webhook.expect(result['job_id'])
+        return result
+    
+    def generate_variants(self, midi_path: MIDISource, variants: List[Dict[str, Any]],
+                          max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Upload a MIDI file once and start one generation per variant concurrently
+        
+        Args:
+            midi_path: Path to the MIDI file, or any source accepted by upload_midi
+            variants: One dict per generation with any of the keyword arguments
+                of generate_from_midi_id ("prompt", "style", "duration")
+            max_workers: Maximum generate requests sent at once
+            
+        Returns:
+            One dict per variant, in the same order as variants, with "variant",
+            "result" (the generation job details, or None) and "error" (the
+            raised exception, or None); a failed variant does not lose the
+            jobs already started for the others
+        """
+        midi_id = self._upload_for_generation(midi_path)
+        if not variants:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(variants))) as executor:
+            futures = [executor.submit(self.generate_from_midi_id, midi_id, **variant)
+                       for variant in variants]
+            results = []
+            for variant, future in zip(variants, futures):
+                error = future.exception()
+                results.append({
+                    "variant": variant,
+                    "result": None if error else future.result(),
+                    "error": error
+                })
+            return results
+    
+    def _upload_for_generation(self, midi_path: MIDISource,
+                               deadline: Optional[Deadline] = None) -> Optional[str]:
+        """
+        Upload a MIDI file for generation, consulting the upload cache first
+        
+        Returns:
+            The midi_id to generate from
+        """
+        if self.upload_cache is None or (_is_midi_path(midi_path) and not Path(midi_path).is_file()):
+            return self.upload_midi(midi_path, deadline=deadline).get('midi_id')
+        
+        digest = _midi_digest(midi_path)
+        if digest is None:
+            return self.upload_midi(midi_path, deadline=deadline).get('midi_id')
+        
+        midi_id = self.upload_cache.get(digest)
+        if midi_id is None:
+            midi_id = self._upload_midi(midi_path, _midi_upload_name(midi_path), {}, True,
+                                        None, deadline, digest).get('midi_id')
+            if midi_id:
+                self.upload_cache.put(digest, midi_id)
+        return midi_id
+    
+    def get_generation_status(self, job_id: str,
+                              deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Check the status of a generation job
+        
+        Args:
+            job_id: The job ID returned from generate_from_midi
+            deadline: Optional Deadline bounding the whole call, retries included
+            
+        Returns:
+            Dict containing job status and result URL if complete; final
+            statuses are answered from the status cache once seen
+        """
+        cached = self.status_cache.get(job_id)
+        if cached is not None:
+            return cached
+        
+        if self._singleflight is None:
+            return self._fetch_generation_status(job_id, deadline)
+        # Concurrent checks of the same job share one request
+        return self._coalesce(("status", job_id),
+                              lambda: self._fetch_generation_status(job_id, deadline), deadline)
+    
+    def _fetch_generation_status(self, job_id: str,
+                                 deadline: Optional[Deadline]) -> Dict[str, Any]:
+        """
+        Send one status request for a job
+        """
+        status_url = f"{self.base_url}/generations/{job_id}"
+        
+        response = self._request("GET", status_url, endpoint="status", deadline=deadline,
+                                 headers=self.headers)
+        
+        if response.status_code != 200:
+            raise StatusCheckError(
+                f"Status check failed: {response.status_code} - {response.text}",
+                response.status_code
+            )
+        
+        status = response.json()
+        self.status_cache.put(job_id, status)
+        return status
+    
+    def wait_for_completion(self, job_id: str, timeout: int = 300, 
+                           poll_interval: int = 5,
+                           polling: Optional[PollingStrategy] = None,
+                           deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Wait for a generation job to complete
+        
+        Args:
+            job_id: The job ID to wait for
+            timeout: Maximum time to wait in seconds
+            poll_interval: Time between status checks in seconds, used when
+                no polling strategy is given or configured on the uploader
+            polling: PollingStrategy for this call (overrides the uploader's)
+            deadline: Optional Deadline; waiting stops at whichever of it and
+                timeout runs out first
+            
+        Returns:
+            Dict containing final job result
+            
+        Raises:
+            TimeoutError: If the job has not finished within timeout
+            DeadlineExceeded: If the deadline runs out first
+        """
+        if self.webhook is not None and self.webhook.is_expected(job_id):
+            return self._wait_for_callback(job_id, timeout, deadline)
+        
+        strategy = polling or self.polling or FixedPolling(poll_interval)
+        delays = strategy.delays(job_id)
+        stop_at = time.monotonic() + timeout
+        
+        while True:
+            remaining = _time_left(stop_at, deadline)
+            if remaining <= 0:
+                break
+            time.sleep(min(next(delays), remaining))
+            
+            status = self.get_generation_status(job_id, deadline)
+            
+            if status.get('status') == 'completed':
+                strategy.job_finished(job_id, status)
+                return status
+            elif status.get('status') == 'failed':
+                strategy.job_finished(job_id, status)
+                raise GenerationFailedError(status)
+        
+        if deadline is not None and deadline.expires_at <= stop_at:
+            deadline.check()
+        raise TimeoutError(f"Generation did not complete within {timeout} seconds")
+    
+    def _wait_for_callback(self, job_id: str, timeout: float,
+                           deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Wait for a job's webhook callback, polling only at the fallback interval
+        """
+        future = self.webhook.expect(job_id)
+        stop_at = time.monotonic() + timeout
+        
+        try:
+            while True:
+                remaining = _time_left(stop_at, deadline)
+                if remaining <= 0:
+                    break
+                try:
+                    return future.result(timeout=min(self.webhook.fallback_interval, remaining))
+                except FutureTimeoutError:
+                    pass
+                
+                # No callback yet; check in case it was lost
+                # (status bodies need not repeat the job_id the way callbacks do)
+                status = self.get_generation_status(job_id, deadline)
+                self.webhook.deliver({**status, "job_id": job_id})
+        finally:
+            if future.done():
+                self.webhook.discard(job_id)
+        
+        if deadline is not None and deadline.expires_at <= stop_at:
+            deadline.check()
+        raise TimeoutError(f"Generation did not complete within {timeout} seconds")
+    
+    def iter_completed(self, job_ids: Iterable[str], timeout: Optional[float] = None,
+                       max_workers: int = 4,
+                       polling: Optional[PollingStrategy] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the final status of each job as soon as it finishes, in completion order
+        
+        Failed jobs are yielded too (with status "failed") rather than raised,
+        so one failure does not stop the others being collected.
+        
+        Args:
+            job_ids: Job IDs returned from generate_from_midi
+            timeout: Maximum seconds to wait for all jobs (default: no limit)
+            max_workers: Maximum status requests in flight at once
+            polling: PollingStrategy deciding when each job is checked
+            
+        Yields:
+            Dict containing each job's final status
+            
+        Raises:
+            TimeoutError: If some jobs have not finished within timeout
+            StatusCheckError: If a job's status cannot be fetched for a reason
+                polling again will not fix (e.g. an unknown job ID)
+        """
+        watch_timeout = float('inf') if timeout is None else timeout
+        with JobWatcher(self, max_workers=max_workers, polling=polling,
+                        timeout=watch_timeout) as watcher:
+            futures = [watcher.watch(job_id) for job_id in job_ids]
+            for future in as_completed(futures, timeout=timeout):
+                try:
+                    yield future.result()
+                except GenerationFailedError as e:
+                    yield e.status
+    
+    def download_result(self, result_url: str, output_path: str, segments: int = 1,
+                        min_segment_size: int = 4 * 1024 * 1024, resume_attempts: int = 3,
+                        expected_sha256: Optional[str] = None,
+                        progress: Optional[Callable[[int, Optional[int], float], None]] = None,
+                        deadline: Optional[Deadline] = None) -> None:
+        """
+        Download the generated audio file
+        
+        Data is written to "<output_path>.part" and only renamed into place
+        once its length (and checksum, if given) has been verified, so a
+        failed transfer never leaves a truncated output behind. A leftover
+        .part file from an earlier attempt is resumed with a Range request.
+        
+        Args:
+            result_url: URL of the generated audio
+            output_path: Path to save the downloaded file
+            segments: Number of byte ranges fetched concurrently. Falls back
+                to a single stream if the server does not support ranges.
+            min_segment_size: Smallest byte range worth its own request
+            resume_attempts: Times a dropped single-stream transfer is resumed
+                before giving up (the .part file is kept for a later call)
+            expected_sha256: Optional hex SHA-256 the finished file must match
+            progress: Optional function called after each buffer is written
+                with (bytes on disk, total bytes or None, bytes/s this call)
+            deadline: Optional Deadline for the whole transfer; a download
+                still running when it expires is abandoned with DeadlineExceeded
+        """
+        part_path = f"{output_path}.part"
+        tracker = _TransferProgress(progress, deadline)
+        
+        downloaded = False
+        if segments > 1 and not os.path.exists(part_path):
+            size = self._probe_range_support(result_url, deadline)
+            if size is not None:
+                parts = min(segments, size // min_segment_size)
+                if parts > 1:
+                    try:
+                        self._download_ranges(result_url, part_path, size, parts, tracker, deadline)
+                        downloaded = True
+                    except _RangeNotSatisfied:
+                        pass
+        
+        if not downloaded:
+            self._download_resumable(result_url, part_path, resume_attempts, tracker, deadline)
+        
+        if expected_sha256 is not None:
+            actual = _file_sha256(part_path)
+            if actual != expected_sha256.lower():
+                os.remove(part_path)
+                raise Exception(f"Download failed: SHA-256 {actual} does not match {expected_sha256}")
+        
+        os.replace(part_path, output_path)
+        if os.path.exists(f"{part_path}.json"):
+            os.remove(f"{part_path}.json")
+    
+    def _download_resumable(self, result_url: str, part_path: str, resume_attempts: int,
+                            tracker: "_TransferProgress",
+                            deadline: Optional[Deadline] = None) -> None:
+        """
+        Stream the result into part_path, resuming from its current size
+        
+        The URL and the server's ETag/Last-Modified are kept in a
+        "<part_path>.json" sidecar. A .part file is only resumed (with
+        If-Range) when its sidecar matches this URL; otherwise it is
+        downloaded again from the start.
+        """
+        meta_path = f"{part_path}.json"
+        for attempt in range(resume_attempts + 1):
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            validator = _part_validator(meta_path, result_url) if offset else None
+            if offset and validator is None:
+                # Nothing proves the .part file belongs to this result; start over
+                os.remove(part_path)
+                offset = 0
+            # Byte counts and offsets must be of the stored bytes, not a decoded stream
+            headers = {"Accept-Encoding": "identity"}
+            if offset:
+                headers.update({"Range": f"bytes={offset}-", "If-Range": validator})
+            try:
+                with self._request("GET", result_url, endpoint="download", deadline=deadline,
+                                   headers=headers, stream=True) as response:
+                    if offset and response.status_code == 416:
+                        total = _content_range_total(response.headers.get('Content-Range'))
+                        if total == offset:
+                            return
+                        # The .part file does not belong to this result; start over
+                        os.remove(part_path)
+                        continue
+                    
+                    if offset and response.status_code == 206:
+                        mode = 'ab'
+                        total = _content_range_total(response.headers.get('Content-Range'))
+                    elif response.status_code == 200:
+                        # A full body: either a fresh download or If-Range
+                        # found the result changed since the .part was written
+                        offset = 0
+                        mode = 'wb'
+                        length = response.headers.get('Content-Length')
+                        total = int(length) if length and length.isdigit() else None
+                        _write_part_meta(meta_path, result_url, response.headers)
+                    else:
+                        raise Exception(f"Download failed: {response.status_code}")
+                    
+                    tracker.start(offset, total)
+                    with open(part_path, mode) as f:
+                        self._copy_body(response, f, tracker)
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError):
+                if deadline is not None:
+                    deadline.check()
+                if attempt == resume_attempts:
+                    raise
+                continue
+            
+            size = os.path.getsize(part_path)
+            if total is not None and size != total:
+                if attempt == resume_attempts:
+                    raise Exception(f"Download failed: got {size} of {total} bytes")
+                continue
+            return
+        
+        raise Exception("Download failed: could not resume the transfer")
+    
+    def _copy_body(self, response: requests.Response, f: BinaryIO,
+                   tracker: "_TransferProgress") -> int:
+        """
+        Copy a streamed response body to a file through one reused buffer
+        
+        Returns:
+            Number of bytes written
+        """
+        buffer = memoryview(bytearray(self.download_buffer_size))
+        raw = response.raw
+        raw.decode_content = True
+        written = 0
+        try:
+            while True:
+                count = raw.readinto(buffer)
+                if not count:
+                    break
+                f.write(buffer[:count])
+                written += count
+                tracker.add(count)
+        except ReadTimeoutError as e:
+            raise requests.exceptions.ReadTimeout(e)
+        except ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        return written
+    
+    def _probe_range_support(self, result_url: str,
+                             deadline: Optional[Deadline] = None) -> Optional[int]:
+        """
+        HEAD the result and return its size if byte ranges are supported, else None
+        """
+        response = self._request("HEAD", result_url, endpoint="download", deadline=deadline,
+                                 headers={"Accept-Encoding": "identity"}, allow_redirects=True)
+        if response.status_code != 200:
+            return None
+        if response.headers.get('Accept-Ranges', '').lower() != 'bytes':
+            return None
+        try:
+            return int(response.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return None
+    
+    def _download_ranges(self, result_url: str, path: str, size: int, parts: int,
+                         tracker: "_TransferProgress",
+                         deadline: Optional[Deadline] = None) -> None:
+        """
+        Fetch `parts` byte ranges concurrently into a preallocated file
+        """
+        with open(path, 'wb') as f:
+            f.truncate(size)
+        
+        bounds = [(size * i // parts, size * (i + 1) // parts - 1) for i in range(parts)]
+        tracker.start(0, size)
+        
+        def fetch(start: int, end: int) -> None:
+            headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+            with self._request("GET", result_url, endpoint="download", deadline=deadline,
+                               headers=headers, stream=True) as response:
+                if response.status_code != 206:
+                    if response.status_code in (200, 416):
+                        raise _RangeNotSatisfied()
+                    raise Exception(f"Download failed: {response.status_code}")
+                
+                # Each range writes through its own handle at its own offset
+                with open(path, 'r+b') as f:
+                    f.seek(start)
+                    written = self._copy_body(response, f, tracker)
+            
+            if written != end - start + 1:
+                raise Exception(f"Download failed: range {start}-{end} returned {written} bytes")
+        
+        try:
+            with ThreadPoolExecutor(max_workers=parts) as executor:
+                futures = [executor.submit(fetch, start, end) for start, end in bounds]
+                for future in futures:
+                    future.result()
+        except BaseException:
+            # A preallocated file with holes must not be mistaken for a resumable one
+            os.remove(path)
+            raise
+    
+    def run_job(self, midi_path: MIDISource, output_path: str, prompt: Optional[str] = None,
+                style: str = "pop", duration: int = 180, timeout: int = 300,
+                deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Upload a MIDI file, generate from it, wait for the result and download it
+        
+        With a journal configured, every step is recorded as it completes so
+        resume() can finish the job after a crash or restart.
+        
+        Args:
+            midi_path: Path to the MIDI file, or any source accepted by upload_midi
+            output_path: Path to save the generated audio
+            prompt: Text prompt to guide generation
+            style: Music style (pop, rock, jazz, classical, etc.)
+            duration: Target duration in seconds
+            timeout: Maximum seconds to wait for the generation
+            deadline: Optional Deadline bounding the whole job
+            
+        Returns:
+            Dict containing the job's final status
+        """
+        entry = {
+            "id": None,
+            "stage": "pending",
+            "source": midi_path,
+            "output_path": output_path,
+            "params": {"prompt": prompt, "style": style, "duration": duration}
+        }
+        if self.journal is not None:
+            source = os.fspath(midi_path) if _is_midi_path(midi_path) else None
+            entry["id"] = self.journal.create(source, output_path, entry["params"])
+        return self._advance_job(entry, timeout, deadline)
+    
+    def resume(self, timeout: int = 300, max_workers: int = 4) -> List[Dict[str, Any]]:
+        """
+        Finish the journal's orphaned jobs from the stage each reached
+        
+        Only jobs no live worker is running are taken (see
+        JobJournal.claim_orphaned): those of workers that died more than the
+        journal's lease ago, and those left by an earlier run of this
+        worker's owner name. Jobs that fail again with a transient error keep
+        their stage (and the error) in the journal and are released, so a
+        later resume() retries them; jobs that cannot succeed (Suno reports
+        the generation failed or the job unknown, or its MIDI data is
+        missing) are marked failed and not retried.
+        
+        Args:
+            timeout: Maximum seconds to wait for each generation
+            max_workers: Jobs resumed at once
+            
+        Returns:
+            One dict per resumed job with "entry" (its journal entry),
+            "result" (its final status, or None) and "error" (the raised
+            exception, or None)
+        """
+        if self.journal is None:
+            raise RuntimeError("resume() needs a JobJournal")
+        entries = self.journal.claim_orphaned()
+        if not entries:
+            return []
+        
+        def finish(entry: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                return {"entry": entry, "result": self._advance_job(entry, timeout), "error": None}
+            except Exception as e:
+                return {"entry": entry, "result": None, "error": e}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(entries))) as executor:
+            return list(executor.map(finish, entries))
+    
+    def _advance_job(self, entry: Dict[str, Any], timeout: int,
+                     deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Carry a job from its recorded stage to "downloaded", journaling each step
+        """
+        journal = self.journal if entry["id"] is not None else None
+        stage = JobJournal.STAGES.index(entry["stage"])
+        params = entry["params"]
+        
+        def advance(new_stage: str, **fields: Any) -> None:
+            entry.update(fields, stage=new_stage)
+            if journal is not None:
+                journal.advance(entry["id"], new_stage, **fields)
+        
+        try:
+            if stage < JobJournal.STAGES.index("uploaded"):
+                if entry["source"] is None:
+                    raise ValueError("Job was not uploaded and its MIDI data was not journaled")
+                advance("uploaded", midi_id=self._upload_for_generation(entry["source"], deadline))
+            
+            if stage < JobJournal.STAGES.index("generating"):
+                # Journal the key first so a lost response is never generated twice
+                advance("generating", idempotency_key=uuid.uuid4().hex)
+            
+            if stage < JobJournal.STAGES.index("generated"):
+                result = self.generate_from_midi_id(
+                    entry["midi_id"], prompt=params.get("prompt"),
+                    style=params.get("style", "pop"), duration=params.get("duration", 180),
+                    idempotency_key=entry["idempotency_key"], deadline=deadline
+                )
+                advance("generated", job_id=result.get("job_id"))
+            
+            if stage < JobJournal.STAGES.index("completed"):
+                status = self.wait_for_completion(entry["job_id"], timeout, deadline=deadline)
+                advance("completed", audio_url=status.get("audio_url"))
+            else:
+                status = self.get_generation_status(entry["job_id"], deadline)
+            
+            self.download_result(entry["audio_url"], entry["output_path"], deadline=deadline)
+            advance("downloaded")
+            return status
+        except Exception as e:
+            if _is_permanent_job_error(e):
+                advance(JobJournal.FAILED, error=str(e))
+            elif journal is not None:
+                # Transient: keep the stage so a later resume() picks it up again
+                journal.advance(entry["id"], entry["stage"], error=str(e))
+                journal.release(entry["id"])
+            raise
+
+
+def _is_permanent_job_error(error: Exception) -> bool:
+    """
+    Whether a journaled job failed in a way retrying it cannot fix
+    
+    That is a generation Suno reports as failed, a status request refused
+    with a client error other than 429 (e.g. an unknown job), or a job with
+    no usable MIDI data (ValueErrors raised locally rather than by requests).
+    """
+    if isinstance(error, GenerationFailedError):
+        return True
+    if isinstance(error, StatusCheckError):
+        return 400 <= error.status_code < 500 and error.status_code != 429
+    return isinstance(error, ValueError) and not isinstance(error, requests.RequestException)
+
+
+def _part_validator(meta_path: str, result_url: str) -> Optional[str]:
+    """
+    If-Range value for resuming a .part file, or None if it cannot be safely resumed
+    """
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or meta.get('url') != result_url:
+        return None
+    return meta.get('etag') or meta.get('last_modified')
+
+
+def _write_part_meta(meta_path: str, result_url: str, headers: Dict[str, str]) -> None:
+    """
+    Record which result (and which version of it) a .part file holds
+    """
+    etag = headers.get('ETag')
+    # Weak ETags are not allowed in If-Range
+    if etag and etag.startswith('W/'):
+        etag = None
+    with open(meta_path, 'w') as f:
+        json.dump({
+            "url": result_url,
+            "etag": etag,
+            "last_modified": headers.get('Last-Modified')
+        }, f)
+
+
+def _time_left(stop_at: float, deadline: Optional[Deadline]) -> float:
+    """
+    Seconds until a monotonic stop time or the deadline, whichever comes first
+    """
+    remaining = stop_at - time.monotonic()
+    return remaining if deadline is None else min(remaining, deadline.remaining())
+
+
+def _content_range_total(content_range: Optional[str]) -> Optional[int]:
+    """
+    Total size from a "bytes start-end/total" Content-Range header, if known
+    """
+    if not content_range or '/' not in content_range:
+        return None
+    total = content_range.rsplit('/', 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+class _TransferProgress:
+    """
+    Thread-safe byte counter that reports download progress and throughput,
+    and stops the transfer once its deadline (if any) has passed
     """
     
-    def __init__(self, api_key: str, base_url: str = "https://api.suno.ai/v1"):
+    def __init__(self, callback: Optional[Callable[[int, Optional[int], float], None]],
+                 deadline: Optional[Deadline] = None):
+        self._callback = callback
+        self._deadline = deadline
+        self._lock = threading.Lock()
+        self._done = 0
+        self._transferred = 0
+        self._total: Optional[int] = None
+        self._started = time.monotonic()
+    
+    def start(self, already_done: int, total: Optional[int]) -> None:
         """
-        Initialize the Suno MIDI uploader
+        Reset the count at the start of a transfer (or a resumed attempt)
+        """
+        with self._lock:
+            self._done = already_done
+            self._total = total
+    
+    def add(self, count: int) -> None:
+        if self._deadline is not None:
+            self._deadline.check()
+        if self._callback is None:
+            return
+        with self._lock:
+            self._done += count
+            self._transferred += count
+            elapsed = time.monotonic() - self._started
+            rate = self._transferred / elapsed if elapsed > 0 else 0.0
+            done, total = self._done, self._total
+        self._callback(done, total, rate)
+
+
+class _RangeNotSatisfied(Exception):
+    """
+    The server ignored or rejected a Range request
+    """
+
+
+class _WatchedJob:
+    """
+    Bookkeeping for one job inside a JobWatcher
+    """
+    
+    __slots__ = ('future', 'delays', 'deadline')
+    
+    def __init__(self, future: Future, delays: Iterator[float], deadline: float):
+        self.future = future
+        self.delays = delays
+        self.deadline = deadline
+
+
+class JobWatcher:
+    """
+    Watches any number of generation jobs with one scheduler thread
+    
+    Pending polls are kept in a heap ordered by when they are next due; the
+    scheduler hands due polls to a small thread pool, so thousands of jobs
+    need only a handful of threads. Each watched job gets a
+    concurrent.futures.Future (use asyncio.wrap_future to await it).
+    """
+    
+    def __init__(self, uploader: SunoMIDIUploader, max_workers: int = 4,
+                 polling: Optional[PollingStrategy] = None, timeout: float = 300):
+        """
+        Start the watcher
+        
+        Args:
+            uploader: Client used for the status requests
+            max_workers: Maximum status requests in flight at once
+            polling: PollingStrategy deciding when each job is checked
+                (default: the uploader's, else exponential backoff)
+            timeout: Default seconds to watch a job before giving up
+        """
+        self.uploader = uploader
+        self.polling = polling or uploader.polling or ExponentialBackoffPolling()
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._jobs: Dict[str, _WatchedJob] = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="suno-job-watcher", daemon=True)
+        self._thread.start()
+    
+    def watch(self, job_id: str, callback: Optional[Callable[[Future], None]] = None,
+              timeout: Optional[float] = None) -> Future:
+        """
+        Start watching a job
+        
+        Args:
+            job_id: The job ID returned from generate_from_midi
+            callback: Optional function called with the future once it resolves
+            timeout: Seconds to watch before failing with TimeoutError
+                (default: the watcher's timeout)
+            
+        Returns:
+            Future resolving to the final status on "completed", or raising
+            GenerationFailedError on "failed"
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("JobWatcher has been closed")
+            
+            job = self._jobs.get(job_id)
+            created = job is None
+            webhook = self.uploader.webhook
+            pushed = created and webhook is not None and webhook.is_expected(job_id)
+            if created:
+                now = time.monotonic()
+                if pushed:
+                    # The callback resolves the job; polls are only a safety net
+                    delays = FixedPolling(webhook.fallback_interval).delays(job_id)
+                    next(delays)
+                else:
+                    delays = self.polling.delays(job_id)
+                deadline = now + (self.timeout if timeout is None else timeout)
+                job = _WatchedJob(Future(), delays, deadline)
+                self._jobs[job_id] = job
+                self._schedule(job_id, now + next(delays))
+        
+        if pushed:
+            webhook.expect(job_id).add_done_callback(
+                lambda future: self._on_callback(job_id, future)
+            )
+        if callback is not None:
+            job.future.add_done_callback(callback)
+        return job.future
+    
+    def pending(self) -> int:
+        """
+        Number of jobs still being watched
+        """
+        with self._cond:
+            return len(self._jobs)
+    
+    def _schedule(self, job_id: str, due: float) -> None:
+        # Caller holds self._cond
+        self._sequence += 1
+        heapq.heappush(self._heap, (due, self._sequence, job_id))
+        self._cond.notify()
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    now = time.monotonic()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    self._cond.wait(self._heap[0][0] - now if self._heap else None)
+                if self._closed:
+                    return
+                
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+            
+            for job_id in due:
+                self._executor.submit(self._poll, job_id)
+    
+    def _finish(self, job_id: str) -> Optional[_WatchedJob]:
+        with self._cond:
+            return self._jobs.pop(job_id, None)
+    
+    def _resolve(self, job_id: str, status: Dict[str, Any]) -> None:
+        job = self._finish(job_id)
+        if job is None:
+            return
+        self.polling.job_finished(job_id, status)
+        if self.uploader.webhook is not None:
+            self.uploader.webhook.discard(job_id)
+        if job.future.cancelled():
+            return
+        if status.get('status') == 'completed':
+            job.future.set_result(status)
+        else:
+            job.future.set_exception(GenerationFailedError(status))
+    
+    def _fail(self, job_id: str, error: BaseException) -> None:
+        # A permanent error (unknown job, bad credentials) will not go away by polling again
+        job = self._finish(job_id)
+        if job is None or job.future.cancelled():
+            return
+        if self.uploader.webhook is not None:
+            self.uploader.webhook.discard(job_id)
+        job.future.set_exception(error)
+    
+    def _on_callback(self, job_id: str, future: Future) -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        status = error.status if isinstance(error, GenerationFailedError) else future.result()
+        self._resolve(job_id, status)
+    
+    def _poll(self, job_id: str) -> None:
+        with self._cond:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return
+        if job.future.cancelled():
+            self._finish(job_id)
+            return
+        
+        try:
+            status = self.uploader.get_generation_status(job_id)
+        except (requests.ConnectionError, requests.Timeout, CircuitOpenError, RateLimitError):
+            # Transient errors are retried on the normal schedule until the deadline
+            status = {}
+        except StatusCheckError as e:
+            if e.status_code < 500:
+                self._fail(job_id, e)
+                return
+            status = {}
+        except Exception as e:
+            self._fail(job_id, e)
+            return
+        
+        if status.get('status') in ('completed', 'failed'):
+            self._resolve(job_id, status)
+            return
+        
+        now = time.monotonic()
+        if now >= job.deadline:
+            if self._finish(job_id) is not None and not job.future.cancelled():
+                job.future.set_exception(
+                    TimeoutError(f"Generation {job_id} did not complete in time")
+                )
+            return
+        
+        with self._cond:
+            if not self._closed:
+                self._schedule(job_id, now + min(next(job.delays), job.deadline - now))
+    
+    def close(self) -> None:
+        """
+        Stop the watcher and cancel the futures of jobs still pending
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+        
+        with self._cond:
+            jobs, self._jobs = self._jobs, {}
+            self._heap.clear()
+        for job in jobs.values():
+            job.future.cancel()
+    
+    def __enter__(self) -> "JobWatcher":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class BatchPipeline:
+    """
+    Runs many MIDI files through upload -> generate -> poll -> download as a pipeline
+    
+    Each stage has its own workers and hands jobs on through a bounded
+    queue, so different files are in different stages at the same time
+    and throughput is set by the slowest stage rather than the sum of all
+    four. When a stage falls behind, its queue fills and the stages before
+    it wait instead of piling up work.
+    """
+    
+    def __init__(self, uploader: SunoMIDIUploader, upload_workers: int = 4,
+                 generate_workers: int = 4, poll_workers: int = 4, download_workers: int = 4,
+                 queue_size: int = 8, max_generating: int = 32, timeout: float = 300,
+                 polling: Optional[PollingStrategy] = None):
+        """
+        Args:
+            uploader: Client used for every request
+            upload_workers: Uploads running at once
+            generate_workers: Generate requests running at once
+            poll_workers: Status requests in flight at once
+            download_workers: Downloads running at once
+            queue_size: Jobs that may wait between two stages
+            max_generating: Jobs submitted but not yet downloaded; generate
+                requests wait while this many are outstanding
+            timeout: Seconds to wait for each generation
+            polling: PollingStrategy for the poll stage (default: the
+                uploader's, else exponential backoff)
+        """
+        self.uploader = uploader
+        self.upload_workers = upload_workers
+        self.generate_workers = generate_workers
+        self.poll_workers = poll_workers
+        self.download_workers = download_workers
+        self.queue_size = queue_size
+        self.max_generating = max_generating
+        self.timeout = timeout
+        self.polling = polling
+    
+    def run(self, jobs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Run every job through the pipeline, yielding each as soon as it finishes
+        
+        Jobs are read from the iterable only as fast as the pipeline takes
+        them, so it may be lazy. Stopping iteration early cancels the jobs
+        not yet started.
+        
+        Args:
+            jobs: Dicts with "midi_path" (any source accepted by upload_midi)
+                and "output_path", plus optional "prompt", "style" and
+                "duration" for generate_from_midi_id
+                
+        Yields:
+            Dict with "job" (the input dict), "result" (the final status, or
+            None) and "error" (the raised exception, or None), in completion order
+        """
+        stop = threading.Event()
+        upload_q: "queue.Queue[Dict[str, Any]]" = queue.Queue(self.queue_size)
+        generate_q: "queue.Queue[Dict[str, Any]]" = queue.Queue(self.queue_size)
+        # Bounded by max_generating rather than by its own size
+        download_q: "queue.Queue[Tuple[Dict[str, Any], Future]]" = queue.Queue()
+        results: "queue.Queue[Any]" = queue.Queue(self.queue_size)
+        generating = threading.BoundedSemaphore(self.max_generating)
+        
+        def put(q: queue.Queue, item: Any) -> bool:
+            # Block while the next stage is backed up, unless the run is stopping
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def finish(job: Dict[str, Any], result: Optional[Dict[str, Any]],
+                   error: Optional[BaseException]) -> None:
+            put(results, {"job": job, "result": result, "error": error})
+        
+        def feed() -> None:
+            count = 0
+            error = None
+            try:
+                for job in jobs:
+                    if not put(upload_q, job):
+                        return
+                    count += 1
+            except Exception as e:
+                error = e
+            put(results, _PipelineFed(count, error))
+        
+        def upload(job: Dict[str, Any]) -> None:
+            try:
+                midi_id = self.uploader._upload_for_generation(job["midi_path"])
+            except Exception as e:
+                finish(job, None, e)
+                return
+            put(generate_q, (job, midi_id))
+        
+        def generate(item: Tuple[Dict[str, Any], str]) -> None:
+            job, midi_id = item
+            while not generating.acquire(timeout=0.1):
+                if stop.is_set():
+                    return
+            try:
+                result = self.uploader.generate_from_midi_id(
+                    midi_id, prompt=job.get("prompt"), style=job.get("style", "pop"),
+                    duration=job.get("duration", 180)
+                )
+                watcher.watch(result["job_id"], lambda future: download_q.put((job, future)))
+            except Exception as e:
+                generating.release()
+                finish(job, None, e)
+        
+        def download(item: Tuple[Dict[str, Any], Future]) -> None:
+            job, future = item
+            try:
+                status = future.result()
+                self.uploader.download_result(status.get("audio_url"), job["output_path"])
+            except Exception as e:
+                finish(job, None, e)
+            else:
+                finish(job, status, None)
+            finally:
+                generating.release()
+        
+        def work(inbox: queue.Queue, handle: Callable[[Any], None]) -> None:
+            while not stop.is_set():
+                try:
+                    item = inbox.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                handle(item)
+        
+        watcher = JobWatcher(self.uploader, max_workers=self.poll_workers,
+                             polling=self.polling, timeout=self.timeout)
+        threads = [threading.Thread(target=feed, name="suno-pipeline-feed", daemon=True)]
+        for name, inbox, handle, count in (("upload", upload_q, upload, self.upload_workers),
+                                           ("generate", generate_q, generate, self.generate_workers),
+                                           ("download", download_q, download, self.download_workers)):
+            threads += [threading.Thread(target=work, args=(inbox, handle),
+                                         name=f"suno-pipeline-{name}", daemon=True)
+                        for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            total = None
+            finished = 0
+            while total is None or finished < total:
+                item = results.get()
+                if isinstance(item, _PipelineFed):
+                    if item.error is not None:
+                        raise item.error
+                    total = item.count
+                    continue
+                finished += 1
+                yield item
+        finally:
+            stop.set()
+            watcher.close()
+            for thread in threads:
+                thread.join()
+
+
+class _PipelineFed:
+    """
+    Marker telling BatchPipeline.run how many jobs were fed in
+    """
+    
+    def __init__(self, count: int, error: Optional[BaseException]):
+        self.count = count
+        self.error = error
+
+
+class AsyncSunoMIDIUploader:
+    """
+    asyncio version of SunoMIDIUploader for driving many jobs from one event loop
+    """
+    
+    def __init__(self, api_key: str, base_url: str = "https://api.suno.ai/v1",
+                 max_concurrency: int = 100, pool_maxsize: int = 100,
+                 pool_maxsize_per_host: int = 0, polling: Optional[PollingStrategy] = None):
+        """
+        Initialize the async Suno MIDI uploader
         
         Args:
             api_key: Your Suno API key
             base_url: Base URL for Suno API (default: https://api.suno.ai/v1)
+            max_concurrency: Maximum API requests this client has in flight
+            pool_maxsize: Maximum open connections in the pool
+            pool_maxsize_per_host: Maximum open connections to a single host
+                (0 means no per-host limit)
+            polling: Default PollingStrategy for wait_for_completion (default:
+                fixed poll_interval)
         """
+        if aiohttp is None:
+            raise ImportError("AsyncSunoMIDIUploader requires aiohttp (pip install aiohttp)")
+        
         self.api_key = api_key
         self.base_url = base_url
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self._max_concurrency = max_concurrency
+        self._pool_maxsize = pool_maxsize
+        self._pool_maxsize_per_host = pool_maxsize_per_host
+        self.polling = polling
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session: Optional["aiohttp.ClientSession"] = None
+    
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """
+        Create the session lazily so it is bound to the running event loop
+        """
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self._pool_maxsize,
+                                             limit_per_host=self._pool_maxsize_per_host)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+    
+    async def close(self) -> None:
+        """
+        Close the connection pool
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def __aenter__(self) -> "AsyncSunoMIDIUploader":
+        self._get_session()
+        return self
     
-    def upload_midi(self, midi_path: str, title: Optional[str] = None, 
-                   style: Optional[str] = None, tags: Optional[list] = None) -> Dict[str, Any]:
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+    
+    async def upload_midi(self, midi_path: MIDISource, title: Optional[str] = None,
+                          style: Optional[str] = None, tags: Optional[list] = None,
+                          filename: Optional[str] = None, validate: bool = True) -> Dict[str, Any]:
         """
         Upload a MIDI file to Suno AI
         
         Args:
-            midi_path: Path to the MIDI file
+            midi_path: Path to the MIDI file, or its contents as bytes,
+                a memoryview or a binary file object
             title: Optional title for the generated music
             style: Optional music style/genre
             tags: Optional list of tags
+            filename: Filename to upload under (defaults to the file's own
+                name, or "upload.mid" for in-memory data)
+            validate: Check the MIDI header and chunk lengths locally first,
+                so corrupt files fail before anything is sent (skipped for
+                non-seekable streams)
             
         Returns:
             Dict containing upload response with job_id
         """
-        midi_file = Path(midi_path)
-        
-        if not midi_file.exists():
-            raise FileNotFoundError(f"MIDI file not found: {midi_path}")
-        
-        if not midi_file.suffix.lower() in ['.mid', '.midi']:
-            raise ValueError("File must be a MIDI file (.mid or .midi)")
-        
-        # Read MIDI file as binary
-        with open(midi_file, 'rb') as f:
-            midi_data = f.read()
-        
-        # Prepare the upload request
-        files = {
-            'midi_file': (midi_file.name, midi_data, 'audio/midi')
-        }
-        
-        data = {}
-        if title:
-            data['title'] = title
-        if style:
-            data['style'] = style
-        if tags:
-            data['tags'] = json.dumps(tags)
+        upload_name = _midi_upload_name(midi_path, filename)
+        if validate and (not hasattr(midi_path, 'read') or _remaining_size(midi_path) is not None):
+            await asyncio.to_thread(validate_midi, midi_path)
         
-        # Upload endpoint
         upload_url = f"{self.base_url}/uploads/midi"
-        
-        # Remove Content-Type from headers for multipart upload
         upload_headers = {
             "Authorization": f"Bearer {self.api_key}"
         }
         
-        response = requests.post(
-            upload_url,
-            headers=upload_headers,
-            files=files,
-            data=data
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"Upload failed: {response.status_code} - {response.text}")
-        
-        return response.json()
+        # aiohttp streams an open file part in chunks, reading off the event loop
+        if _is_midi_path(midi_path):
+            f = await asyncio.to_thread(open, midi_path, 'rb')
+        else:
+            f = None
+        try:
+            form = aiohttp.FormData()
+            if title:
+                form.add_field('title', title)
+            if style:
+                form.add_field('style', style)
+            if tags:
+                form.add_field('tags', json.dumps(tags))
+            form.add_field('midi_file', midi_path if f is None else f,
+                           filename=upload_name, content_type='audio/midi')
+            
+            session = self._get_session()
+            async with self._semaphore:
+                async with session.post(upload_url, headers=upload_headers, data=form) as response:
+                    if response.status != 200:
+                        raise Exception(f"Upload failed: {response.status} - {await response.text()}")
+                    return await response.json()
+        finally:
+            if f is not None:
+                await asyncio.to_thread(f.close)
     
-    def generate_from_midi(self, midi_path: str, prompt: Optional[str] = None,
-                          style: str = "pop", duration: int = 180) -> Dict[str, Any]:
+    async def generate_from_midi(self, midi_path: MIDISource, prompt: Optional[str] = None,
+                                 style: str = "pop", duration: int = 180) -> Dict[str, Any]:
         """
         Generate music from MIDI file with additional parameters
         
         Args:
-            midi_path: Path to the MIDI file
+            midi_path: Path to the MIDI file, or any source accepted by upload_midi
             prompt: Text prompt to guide generation
             style: Music style (pop, rock, jazz, classical, etc.)
             duration: Target duration in seconds
@@ -98,11 +3437,9 @@ class SunoMIDIUploader:
         Returns:
             Dict containing generation job details
         """
-        # First upload the MIDI
-        upload_result = self.upload_midi(midi_path)
+        upload_result = await self.upload_midi(midi_path)
         midi_id = upload_result.get('midi_id')
         
-        # Generate music from uploaded MIDI
         generate_url = f"{self.base_url}/generate"
         
         payload = {
@@ -114,18 +3451,18 @@ class SunoMIDIUploader:
         if prompt:
             payload["prompt"] = prompt
         
-        response = requests.post(
-            generate_url,
-            headers=self.headers,
-            json=payload
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"Generation failed: {response.status_code} - {response.text}")
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.post(generate_url, headers=self.headers, json=payload) as response:
+                if response.status != 200:
+                    raise Exception(f"Generation failed: {response.status} - {await response.text()}")
+                result = await response.json()
         
-        return response.json()
+        if self.polling is not None and result.get('job_id'):
+            self.polling.job_submitted(result['job_id'], style, duration)
+        return result
     
-    def get_generation_status(self, job_id: str) -> Dict[str, Any]:
+    async def get_generation_status(self, job_id: str) -> Dict[str, Any]:
         """
         Check the status of a generation job
         
@@ -137,56 +3474,77 @@ class SunoMIDIUploader:
         """
         status_url = f"{self.base_url}/generations/{job_id}"
         
-        response = requests.get(status_url, headers=self.headers)
-        
-        if response.status_code != 200:
-            raise Exception(f"Status check failed: {response.status_code} - {response.text}")
-        
-        return response.json()
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(status_url, headers=self.headers) as response:
+                if response.status != 200:
+                    raise StatusCheckError(
+                        f"Status check failed: {response.status} - {await response.text()}",
+                        response.status
+                    )
+                return await response.json()
     
-    def wait_for_completion(self, job_id: str, timeout: int = 300, 
-                           poll_interval: int = 5) -> Dict[str, Any]:
+    async def wait_for_completion(self, job_id: str, timeout: int = 300,
+                                  poll_interval: int = 5,
+                                  polling: Optional[PollingStrategy] = None) -> Dict[str, Any]:
         """
         Wait for a generation job to complete
         
         Args:
             job_id: The job ID to wait for
             timeout: Maximum time to wait in seconds
-            poll_interval: Time between status checks in seconds
+            poll_interval: Time between status checks in seconds, used when
+                no polling strategy is given or configured on the client
+            polling: PollingStrategy for this call (overrides the client's)
             
         Returns:
             Dict containing final job result
         """
-        start_time = time.time()
+        strategy = polling or self.polling or FixedPolling(poll_interval)
+        delays = strategy.delays(job_id)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         
-        while time.time() - start_time < timeout:
-            status = self.get_generation_status(job_id)
+        while True:
+            remaining = timeout - (loop.time() - start_time)
+            if remaining <= 0:
+                break
+            # Sleeping does not hold a semaphore slot
+            await asyncio.sleep(min(next(delays), remaining))
+            
+            status = await self.get_generation_status(job_id)
             
             if status.get('status') == 'completed':
+                strategy.job_finished(job_id, status)
                 return status
             elif status.get('status') == 'failed':
-                raise Exception(f"Generation failed: {status.get('error')}")
-            
-            time.sleep(poll_interval)
+                strategy.job_finished(job_id, status)
+                raise GenerationFailedError(status)
         
         raise TimeoutError(f"Generation did not complete within {timeout} seconds")
     
-    def download_result(self, result_url: str, output_path: str) -> None:
+    async def download_result(self, result_url: str, output_path: str,
+                              chunk_size: int = 256 * 1024) -> None:
         """
         Download the generated audio file
         
         Args:
             result_url: URL of the generated audio
             output_path: Path to save the downloaded file
+            chunk_size: Bytes read from the socket per write
         """
-        response = requests.get(result_url, stream=True)
-        
-        if response.status_code != 200:
-            raise Exception(f"Download failed: {response.status_code}")
-        
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(result_url) as response:
+                if response.status != 200:
+                    raise Exception(f"Download failed: {response.status}")
+                
+                f = await asyncio.to_thread(open, output_path, 'wb')
+                try:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
 
 
 # Example usage
@@ -219,5 +3577,20 @@ if __name__ == "__main__":
         uploader.download_result(audio_url, "output.mp3")
         print("Download complete! Saved to output.mp3")
         
+        # Many files: upload, generate, poll and download overlap across files
+        print("Generating music for a batch of MIDI files...")
+        batch = [
+            {"midi_path": f"path/to/your/file{i}.mid", "output_path": f"output{i}.mp3",
+             "style": "edm"}
+            for i in range(1, 4)
+        ]
+        for outcome in BatchPipeline(uploader).run(batch):
+            if outcome["error"] is not None:
+                print(f"{outcome['job']['midi_path']} failed: {outcome['error']}")
+            else:
+                print(f"Saved {outcome['job']['output_path']}")
+        
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        uploader.close()
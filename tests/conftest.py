@@ -0,0 +1,260 @@
+import gzip
+import importlib.util
+import json
+import sys
+import threading
+import time
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = Path(__file__).resolve().parent.parent / ".py"
+
+
+@pytest.fixture(scope="session")
+def suno():
+    """
+    The uploader module (it lives in a dot-named file, so it is loaded by path)
+    """
+    spec = importlib.util.spec_from_file_location("suno_midi_uploader", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["suno_midi_uploader"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_midi(tracks: int = 1) -> bytes:
+    """
+    A minimal valid Standard MIDI File
+    """
+    track = b"MTrk" + (4).to_bytes(4, "big") + b"\x00\xff\x2f\x00"
+    return b"MThd" + (6).to_bytes(4, "big") + (1).to_bytes(2, "big") + \
+        tracks.to_bytes(2, "big") + (96).to_bytes(2, "big") + track * tracks
+
+
+class FakeSuno:
+    """
+    Stand-in for the Suno API: uploads, generations that finish after
+    job_time seconds (POSTing to their callback_url if given), status
+    checks and result downloads with ETag/Range/If-Range and optional
+    gzip support
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.job_time = 0.2
+        self.audio = {}
+        self.jobs = {}
+        self.requests = []
+        # endpoint -> list of statuses to answer with before behaving normally
+        self.fail_next = {}
+        # endpoint -> seconds to stall before answering
+        self.delay = {}
+        # audio names served gzip-encoded to clients that accept it
+        self.gzipped = set()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeSunoHandler)
+        self.server.daemon_threads = True
+        self.server.fake = self
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.base_url = f"{self.url}/v1"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def count(self, endpoint: str) -> int:
+        with self.lock:
+            return sum(1 for seen, _ in self.requests if seen == endpoint)
+
+    def add_audio(self, name: str, data: bytes, etag: str = None, gzipped: bool = False) -> str:
+        self.audio[name] = (data, etag or f'"{uuid.uuid4().hex}"')
+        if gzipped:
+            self.gzipped.add(name)
+        return f"{self.url}/audio/{name}"
+
+    def job_status(self, job_id: str) -> dict:
+        job = self.jobs[job_id]
+        if time.monotonic() < job["done_at"]:
+            return {"job_id": job_id, "status": "processing"}
+        if job["fail"]:
+            return {"job_id": job_id, "status": "failed", "error": "boom"}
+        return {"job_id": job_id, "status": "completed", "audio_url": job["audio_url"]}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _FakeSunoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _record(self, endpoint: str):
+        fake = self.server.fake
+        with fake.lock:
+            fake.requests.append((endpoint, dict(self.headers)))
+            pending = fake.fail_next.get(endpoint)
+            failure = pending.pop(0) if pending else None
+        time.sleep(fake.delay.get(endpoint, 0))
+        return failure
+
+    def _json(self, code: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if code == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _gzip(self, name: str) -> bool:
+        return name in self.server.fake.gzipped and \
+            "gzip" in self.headers.get("Accept-Encoding", "")
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            data = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return data
+                data += self.rfile.read(size)
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):
+        fake = self.server.fake
+        body = self._read_body()
+        if self.path.endswith("/uploads/midi"):
+            failure = self._record("upload")
+            if failure:
+                return self._json(failure, {"error": "injected"})
+            return self._json(200, {"midi_id": uuid.uuid4().hex, "size": len(body)})
+        if self.path.endswith("/generate"):
+            failure = self._record("generate")
+            if failure:
+                return self._json(failure, {"error": "injected"})
+            payload = json.loads(body)
+            job_id = uuid.uuid4().hex
+            fake.jobs[job_id] = {
+                "done_at": time.monotonic() + fake.job_time,
+                "fail": payload.get("prompt") == "fail",
+                "audio_url": fake.add_audio(job_id, job_id.encode() * 64)
+            }
+            if payload.get("callback_url"):
+                threading.Timer(fake.job_time, _send_callback,
+                                (payload["callback_url"], fake.job_status, job_id)).start()
+            return self._json(200, {"job_id": job_id, "status": "processing"})
+        self._json(404, {"error": "not found"})
+
+    def do_GET(self):
+        fake = self.server.fake
+        if "/generations/" in self.path:
+            failure = self._record("status")
+            if failure:
+                return self._json(failure, {"error": "injected"})
+            job_id = self.path.rsplit("/", 1)[1]
+            if job_id not in fake.jobs:
+                return self._json(404, {"error": "no such job"})
+            return self._json(200, fake.job_status(job_id))
+        if "/audio/" in self.path:
+            self._record("download")
+            name = self.path.rsplit("/", 1)[1]
+            if name not in fake.audio:
+                return self._json(404, {"error": "no such result"})
+            data, etag = fake.audio[name]
+            code = 200
+            headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+            byte_range = self.headers.get("Range")
+            if_range = self.headers.get("If-Range")
+            if byte_range and (if_range is None or if_range == etag):
+                start, end = byte_range.split("=")[1].split("-")
+                start = int(start)
+                end = int(end) if end else len(data) - 1
+                if start >= len(data):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(data)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+                data = data[start:end + 1]
+                code = 206
+            if self._gzip(name):
+                data = gzip.compress(data)
+                headers["Content-Encoding"] = "gzip"
+            self.send_response(code)
+            self.send_header("Content-Length", str(len(data)))
+            for header, value in headers.items():
+                self.send_header(header, value)
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        self._json(404, {"error": "not found"})
+
+    def do_HEAD(self):
+        fake = self.server.fake
+        self._record("probe")
+        name = self.path.rsplit("/", 1)[1]
+        if "/audio/" not in self.path or name not in fake.audio:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data, etag = fake.audio[name]
+        self.send_response(200)
+        if self._gzip(name):
+            data = gzip.compress(data)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.end_headers()
+
+
+def _send_callback(url: str, job_status, job_id: str):
+    request = urllib.request.Request(url, data=json.dumps(job_status(job_id)).encode(),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        urllib.request.urlopen(request, timeout=5).close()
+    except OSError:
+        pass
+
+
+@pytest.fixture
+def fake_suno():
+    fake = FakeSuno()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def make_uploader(suno, fake_suno):
+    """
+    Factory for SunoMIDIUploaders pointed at fake_suno, closed after the test
+
+    Keyword arguments are passed to SunoMIDIUploader; retries back off
+    for 10 ms instead of 0.5 s unless a retry_policy is given.
+    """
+    uploaders = []
+
+    def make(**kwargs):
+        kwargs.setdefault("pool_maxsize", 16)
+        kwargs.setdefault("retry_policy", suno.RetryPolicy(backoff=0.01))
+        uploader = suno.SunoMIDIUploader("key", fake_suno.base_url, **kwargs)
+        uploaders.append(uploader)
+        return uploader
+
+    yield make
+    for uploader in uploaders:
+        uploader.close()
+
+
+@pytest.fixture
+def uploader(make_uploader):
+    return make_uploader()
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from conftest import make_midi
+
+
+def test_failed_variant_keeps_the_jobs_of_the_others(uploader, fake_suno):
+    fake_suno.fail_next["generate"] = [400]
+    variants = [{"prompt": "calm"}, {"prompt": "loud"}, {"style": "jazz"}]
+
+    results = uploader.generate_variants(make_midi(), variants)
+
+    assert [r["variant"] for r in results] == variants
+    failed = [r for r in results if r["error"] is not None]
+    started = [r["result"]["job_id"] for r in results if r["error"] is None]
+    assert len(failed) == 1 and failed[0]["result"] is None
+    assert len(started) == 2 and all(job_id in fake_suno.jobs for job_id in started)
+
+
+def write_midis(tmp_path, count, tracks=1):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"song{i}.mid"
+        path.write_bytes(make_midi(tracks))
+        paths.append(str(path))
+    return paths
+
+
+def test_upload_many_yields_in_completion_order_with_per_file_errors(uploader, fake_suno, tmp_path):
+    fake_suno.delay["upload"] = 0.3
+    fake_suno.fail_next["upload"] = [400]
+    paths = write_midis(tmp_path, 2)
+    missing = str(tmp_path / "missing.mid")
+
+    results = list(uploader.upload_many(paths + [missing], max_workers=3))
+
+    # The missing file fails at once, before either upload is answered
+    assert results[0]["path"] == missing and results[0]["result"] is None
+    assert isinstance(results[0]["error"], OSError)
+    assert sorted(r["path"] for r in results[1:]) == paths
+    assert sorted(r["error"] is None for r in results[1:]) == [False, True]
+
+
+def test_upload_many_bounds_the_bytes_in_flight(uploader, fake_suno, tmp_path):
+    fake_suno.delay["upload"] = 0.1
+    paths = write_midis(tmp_path, 6, tracks=100)
+    size = len(make_midi(100))
+    upload_midi = uploader.upload_midi
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def tracking_upload(*args, **kwargs):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        try:
+            return upload_midi(*args, **kwargs)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    uploader.upload_midi = tracking_upload
+    results = list(uploader.upload_many(paths, max_workers=6, max_inflight_bytes=2 * size))
+
+    assert all(r["error"] is None for r in results)
+    assert running[1] == 2
+
+
+def test_closing_upload_many_early_stops_new_uploads(uploader, fake_suno, tmp_path):
+    fake_suno.delay["upload"] = 0.2
+    uploads = uploader.upload_many(write_midis(tmp_path, 10), max_workers=2)
+
+    next(uploads)
+    uploads.close()
+    sent = fake_suno.count("upload")
+    time.sleep(0.5)
+
+    assert sent < 10
+    assert fake_suno.count("upload") == sent
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def breaker(suno):
+    return suno.CircuitBreaker(failure_threshold=3, recovery_timeout=0.2)
+
+
+def test_opens_after_consecutive_failures(suno, breaker):
+    for _ in range(3):
+        breaker.before_call("status")
+        breaker.record_failure("status")
+
+    assert breaker.state("status") == "open"
+    assert breaker.state("generate") == "closed"
+    with pytest.raises(suno.CircuitOpenError) as excinfo:
+        breaker.before_call("status")
+    assert excinfo.value.endpoint == "status"
+    assert 0 < excinfo.value.retry_after <= 0.2
+
+
+def test_success_resets_the_failure_count(breaker):
+    for _ in range(2):
+        breaker.record_failure("status")
+    breaker.record_success("status")
+    for _ in range(2):
+        breaker.record_failure("status")
+
+    assert breaker.state("status") == "closed"
+
+
+def test_half_open_allows_one_trial_call(suno, breaker):
+    for _ in range(3):
+        breaker.record_failure("status")
+    time.sleep(0.25)
+
+    assert breaker.state("status") == "half_open"
+    breaker.before_call("status")
+    with pytest.raises(suno.CircuitOpenError):
+        breaker.before_call("status")
+    breaker.record_success("status")
+    assert breaker.state("status") == "closed"
+
+
+def test_failed_trial_reopens(breaker):
+    for _ in range(3):
+        breaker.record_failure("status")
+    time.sleep(0.25)
+    breaker.before_call("status")
+    breaker.record_failure("status")
+
+    assert breaker.state("status") == "open"
+
+
+def test_uploader_fails_fast_while_open(suno, fake_suno, make_uploader, breaker):
+    fake_suno.fail_next["status"] = [503] * 10
+    with make_uploader(circuit_breaker=breaker) as uploader:
+        with pytest.raises(suno.CircuitOpenError):
+            uploader.get_generation_status("job")
+        with pytest.raises(suno.CircuitOpenError):
+            uploader.get_generation_status("job")
+
+    assert fake_suno.count("status") == 3
@@ -0,0 +1,91 @@
+import builtins
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import make_midi
+
+
+def test_concurrent_status_checks_share_requests_but_not_results(uploader, fake_suno):
+    job_id = uploader.generate_from_midi(make_midi())["job_id"]
+    fake_suno.delay["status"] = 0.2
+
+    with ThreadPoolExecutor(16) as executor:
+        results = list(executor.map(lambda _: uploader.get_generation_status(job_id), range(16)))
+
+    assert fake_suno.count("status") < 16
+    assert len({id(result) for result in results}) == 16
+    results[0]["status"] = "mutated"
+    assert all(result["status"] != "mutated" for result in results[1:])
+
+
+def test_waiter_outlives_the_first_callers_deadline(suno, uploader, fake_suno):
+    job_id = uploader.generate_from_midi(make_midi())["job_id"]
+    fake_suno.delay["status"] = 0.6
+
+    with ThreadPoolExecutor(1) as executor:
+        hasty = executor.submit(uploader.get_generation_status, job_id, suno.Deadline(0.3))
+        time.sleep(0.1)
+        status = uploader.get_generation_status(job_id)
+
+    with pytest.raises(suno.DeadlineExceeded):
+        hasty.result()
+    assert status["job_id"] == job_id
+    assert fake_suno.count("status") == 2
+
+
+def test_concurrent_identical_uploads_share_one_request(uploader, fake_suno):
+    midi = make_midi()
+    fake_suno.delay["upload"] = 0.3
+
+    with ThreadPoolExecutor(16) as executor:
+        results = list(executor.map(lambda _: uploader.upload_midi(midi, title="t"), range(16)))
+
+    assert fake_suno.count("upload") == 1
+    assert len({result["midi_id"] for result in results}) == 1
+
+
+def test_different_metadata_is_not_coalesced(uploader, fake_suno):
+    midi = make_midi()
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda title: uploader.upload_midi(midi, title=title), "abcd"))
+
+    assert fake_suno.count("upload") == 4
+
+
+def count_reads(monkeypatch, path):
+    opened = []
+    real_open = builtins.open
+
+    def tracking_open(file, *args, **kwargs):
+        if str(file) == str(path):
+            opened.append(file)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", tracking_open)
+    return opened
+
+
+def test_path_upload_reads_the_file_once(uploader, tmp_path, monkeypatch):
+    path = tmp_path / "song.mid"
+    path.write_bytes(make_midi())
+    opened = count_reads(monkeypatch, path)
+
+    uploader.upload_midi(str(path))
+
+    assert len(opened) == 1
+
+
+def test_cached_generation_hashes_the_file_once(suno, make_uploader, tmp_path, monkeypatch):
+    path = tmp_path / "song.mid"
+    path.write_bytes(make_midi())
+    cache = suno.MIDIUploadCache(str(tmp_path / "cache.sqlite3"))
+    with make_uploader(upload_cache=cache) as uploader:
+        opened = count_reads(monkeypatch, path)
+        uploader.generate_from_midi(str(path))
+    cache.close()
+
+    # One read to hash for the cache, one to upload
+    assert len(opened) == 2
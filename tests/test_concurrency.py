@@ -0,0 +1,49 @@
+import pytest
+
+from conftest import make_midi
+
+
+def run_calls(controller, calls):
+    for endpoint, latency in calls:
+        controller.acquire()
+        controller.release(latency, endpoint=endpoint)
+
+
+def test_limit_grows_with_mixed_endpoint_latencies(suno):
+    controller = suno.AIMDConcurrencyController(initial=16, maximum=64)
+
+    run_calls(controller, [("generate", 0.02), ("upload", 0.4)] * 200)
+
+    assert controller.limit > 16
+
+
+def test_latency_spike_on_one_endpoint_cuts_limit(suno):
+    controller = suno.AIMDConcurrencyController(initial=16, maximum=64)
+    run_calls(controller, [("generate", 0.02)] * 50)
+
+    run_calls(controller, [("generate", 0.5)] * 10)
+
+    assert controller.limit < 16
+
+
+def test_overload_cuts_limit(suno):
+    controller = suno.AIMDConcurrencyController(initial=16)
+    controller.acquire()
+
+    controller.release(0.01, overloaded=True, endpoint="generate")
+
+    assert controller.limit == 8
+
+
+def test_local_deadline_does_not_cut_limit(suno, fake_suno, make_uploader):
+    controller = suno.AIMDConcurrencyController(initial=16)
+    limiter = suno.RateLimiter({"upload": (0.1, 1)})
+    with make_uploader(concurrency=controller, rate_limiter=limiter,
+                       coalesce=False) as uploader:
+        uploader.upload_midi(make_midi())
+        with pytest.raises(suno.DeadlineExceeded):
+            uploader.upload_midi(make_midi(), deadline=suno.Deadline(0.5))
+
+    assert controller.limit >= 16
+    assert controller._inflight == 0
+    assert fake_suno.count("upload") == 1
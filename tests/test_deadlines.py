@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from conftest import make_midi
+
+
+def test_one_deadline_covers_the_whole_job(suno, uploader, tmp_path):
+    deadline = suno.Deadline(10)
+
+    job = uploader.generate_from_midi(make_midi(), deadline=deadline)
+    status = uploader.wait_for_completion(job["job_id"], poll_interval=0.05, deadline=deadline)
+    uploader.download_result(status["audio_url"], str(tmp_path / "out.mp3"), deadline=deadline)
+
+    assert (tmp_path / "out.mp3").exists()
+    assert 0 < deadline.remaining() < 10
+
+
+def test_wait_stops_at_the_deadline(suno, uploader, fake_suno):
+    fake_suno.job_time = 5
+    job_id = uploader.generate_from_midi(make_midi())["job_id"]
+    start = time.monotonic()
+
+    with pytest.raises(suno.DeadlineExceeded):
+        uploader.wait_for_completion(job_id, poll_interval=0.05, deadline=suno.Deadline(0.3))
+
+    assert time.monotonic() - start < 1
+
+
+def test_shorter_timeout_raises_plain_timeout_error(suno, uploader, fake_suno):
+    fake_suno.job_time = 5
+    job_id = uploader.generate_from_midi(make_midi())["job_id"]
+
+    with pytest.raises(TimeoutError) as excinfo:
+        uploader.wait_for_completion(job_id, timeout=0.2, poll_interval=0.05,
+                                     deadline=suno.Deadline(10))
+
+    assert not isinstance(excinfo.value, suno.DeadlineExceeded)
+
+
+def test_status_calls_keep_the_deadline_when_timeout_is_shorter(suno, uploader, fake_suno):
+    job_id = uploader.generate_from_midi(make_midi())["job_id"]
+    fake_suno.delay["status"] = 3
+    start = time.monotonic()
+
+    with pytest.raises(TimeoutError):
+        uploader.wait_for_completion(job_id, timeout=0.9, poll_interval=0.05,
+                                     deadline=suno.Deadline(1.0))
+
+    assert time.monotonic() - start < 1.5
+
+
+def test_retry_backoff_does_not_outlast_the_deadline(suno, fake_suno, make_uploader):
+    fake_suno.fail_next["status"] = [503] * 3
+    with make_uploader(retry_policy=suno.RetryPolicy(backoff=5)) as uploader:
+        start = time.monotonic()
+        with pytest.raises(suno.DeadlineExceeded):
+            uploader.get_generation_status("job", deadline=suno.Deadline(0.5))
+
+    assert time.monotonic() - start < 0.5
+
+
+def test_expired_deadline_sends_nothing(suno, uploader, fake_suno):
+    with pytest.raises(suno.DeadlineExceeded):
+        uploader.upload_midi(make_midi(), deadline=suno.Deadline(0))
+
+    assert fake_suno.count("upload") == 0
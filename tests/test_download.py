@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+
+
+def range_headers(fake_suno):
+    return [(headers.get("Range"), headers.get("If-Range"))
+            for endpoint, headers in fake_suno.requests if endpoint == "download"]
+
+
+def test_download_writes_output_and_removes_part_files(uploader, fake_suno, tmp_path):
+    data = os.urandom(200_000)
+    url = fake_suno.add_audio("song", data)
+    output = tmp_path / "out.mp3"
+
+    uploader.download_result(url, str(output))
+
+    assert output.read_bytes() == data
+    assert sorted(os.listdir(tmp_path)) == ["out.mp3"]
+
+
+def test_part_file_from_another_result_is_not_resumed(uploader, fake_suno, tmp_path):
+    data = os.urandom(1_000_000)
+    url = fake_suno.add_audio("new", data)
+    output = tmp_path / "output.mp3"
+    (tmp_path / "output.mp3.part").write_bytes(b"OLD" * 100_000)
+
+    uploader.download_result(url, str(output))
+
+    assert output.read_bytes() == data
+    assert range_headers(fake_suno) == [(None, None)]
+
+
+def test_part_file_with_matching_sidecar_is_resumed(uploader, fake_suno, tmp_path):
+    data = os.urandom(500_000)
+    url = fake_suno.add_audio("song", data, etag='"v1"')
+    output = tmp_path / "output.mp3"
+    (tmp_path / "output.mp3.part").write_bytes(data[:123_456])
+    (tmp_path / "output.mp3.part.json").write_text(
+        json.dumps({"url": url, "etag": '"v1"', "last_modified": None}))
+
+    uploader.download_result(url, str(output))
+
+    assert output.read_bytes() == data
+    assert range_headers(fake_suno) == [("bytes=123456-", '"v1"')]
+
+
+def test_changed_result_is_downloaded_again(uploader, fake_suno, tmp_path):
+    data = os.urandom(500_000)
+    url = fake_suno.add_audio("song", data, etag='"v2"')
+    output = tmp_path / "output.mp3"
+    (tmp_path / "output.mp3.part").write_bytes(b"OLD" * 50_000)
+    (tmp_path / "output.mp3.part.json").write_text(
+        json.dumps({"url": url, "etag": '"v1"', "last_modified": None}))
+
+    uploader.download_result(url, str(output))
+
+    # If-Range did not match, so the server sent the whole new file
+    assert output.read_bytes() == data
+    assert range_headers(fake_suno) == [("bytes=150000-", '"v1"')]
+
+
+def test_ranged_download(uploader, fake_suno, tmp_path):
+    data = os.urandom(3_000_000)
+    url = fake_suno.add_audio("big", data)
+    output = tmp_path / "out.mp3"
+
+    uploader.download_result(url, str(output), segments=4, min_segment_size=500_000)
+
+    assert output.read_bytes() == data
+    assert len(range_headers(fake_suno)) == 4
+
+
+@pytest.mark.parametrize("segments", [1, 4])
+def test_download_asks_for_unencoded_bytes(uploader, fake_suno, tmp_path, segments):
+    data = os.urandom(1_000_000) + bytes(1_000_000)
+    url = fake_suno.add_audio("song", data, gzipped=True)
+    output = tmp_path / "out.mp3"
+
+    uploader.download_result(url, str(output), segments=segments, min_segment_size=200_000)
+
+    assert output.read_bytes() == data
+    assert all(headers.get("Accept-Encoding") == "identity"
+               for endpoint, headers in fake_suno.requests if endpoint in ("download", "probe"))
+
+
+def test_progress_reports_bytes_on_disk_total_and_rate(make_uploader, fake_suno, tmp_path):
+    uploader = make_uploader(download_buffer_size=64 * 1024)
+    data = os.urandom(1_000_000)
+    url = fake_suno.add_audio("song", data, etag='"v1"')
+    output = tmp_path / "output.mp3"
+    (tmp_path / "output.mp3.part").write_bytes(data[:100_000])
+    (tmp_path / "output.mp3.part.json").write_text(
+        json.dumps({"url": url, "etag": '"v1"', "last_modified": None}))
+    calls = []
+
+    uploader.download_result(url, str(output), progress=lambda *args: calls.append(args))
+
+    done = [call[0] for call in calls]
+    # Counting starts from the resumed .part file, one buffer at a time at most
+    assert done[0] > 100_000 and done[-1] == len(data)
+    assert all(0 < b - a <= 64 * 1024 for a, b in zip([100_000] + done, done))
+    assert len(calls) >= (len(data) - 100_000) // (64 * 1024)
+    assert all(total == len(data) and rate > 0 for _, total, rate in calls)
+    assert output.stat().st_size == len(data)
@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+from conftest import make_midi
+
+
+@pytest.fixture
+def fast_polling(suno):
+    return suno.FixedPolling(0.05)
+
+
+def test_watch_resolves_completed_and_failed_jobs(suno, uploader, fast_polling):
+    good = uploader.generate_from_midi(make_midi())["job_id"]
+    bad = uploader.generate_from_midi(make_midi(), prompt="fail")["job_id"]
+
+    with suno.JobWatcher(uploader, polling=fast_polling, timeout=10) as watcher:
+        assert watcher.watch(good).result(timeout=10)["status"] == "completed"
+        with pytest.raises(suno.GenerationFailedError):
+            watcher.watch(bad).result(timeout=10)
+
+
+def test_permanent_status_error_fails_the_job(suno, uploader, fake_suno, fast_polling):
+    with suno.JobWatcher(uploader, polling=fast_polling, timeout=60) as watcher:
+        future = watcher.watch("nonexistent")
+        with pytest.raises(suno.StatusCheckError) as excinfo:
+            future.result(timeout=5)
+
+    assert excinfo.value.status_code == 404
+    assert fake_suno.count("status") == 1
+
+
+def test_transient_status_errors_are_retried(suno, uploader, fake_suno, fast_polling):
+    job_id = uploader.generate_from_midi(make_midi())["job_id"]
+    # One more 503 than the retry policy absorbs, so the first poll fails
+    # outright (but not enough to open the circuit)
+    fake_suno.fail_next["status"] = [503] * 4
+
+    with suno.JobWatcher(uploader, polling=fast_polling, timeout=10) as watcher:
+        assert watcher.watch(job_id).result(timeout=10)["status"] == "completed"
+
+
+def test_iter_completed_finishes_on_unknown_job(suno, uploader, fast_polling):
+    good = uploader.generate_from_midi(make_midi())["job_id"]
+    start = time.monotonic()
+
+    seen = []
+    with pytest.raises(suno.StatusCheckError):
+        for status in uploader.iter_completed([good, "nonexistent"], polling=fast_polling):
+            seen.append(status["job_id"])
+
+    assert time.monotonic() - start < 5
+    assert seen in ([], [good])
@@ -0,0 +1,122 @@
+import time
+
+import pytest
+
+from conftest import make_midi
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "jobs.sqlite3")
+
+
+@pytest.fixture
+def midi_file(tmp_path):
+    path = tmp_path / "song.mid"
+    path.write_bytes(make_midi())
+    return str(path)
+
+
+def add_job(journal, stage="generated", **fields):
+    entry_id = journal.create("song.mid", "out.mp3", {"style": "pop", "duration": 10})
+    journal.advance(entry_id, stage, **fields)
+    return entry_id
+
+
+def test_live_jobs_are_not_claimed_by_other_workers(suno, journal_path):
+    worker = suno.JobJournal(journal_path, owner="a")
+    other = suno.JobJournal(journal_path, owner="b")
+    add_job(worker)
+
+    assert other.claim_orphaned() == []
+    assert len(other.unfinished()) == 1
+    worker.close()
+    other.close()
+
+
+def test_jobs_of_a_dead_worker_are_claimed_after_the_lease(suno, journal_path):
+    dead = suno.JobJournal(journal_path, owner="a", lease=0.3)
+    entry_id = add_job(dead)
+    dead.close()
+    other = suno.JobJournal(journal_path, owner="b", lease=0.3)
+
+    assert other.claim_orphaned() == []
+    time.sleep(0.4)
+    claimed = other.claim_orphaned()
+
+    assert [entry["id"] for entry in claimed] == [entry_id]
+    assert claimed[0]["owner"] == "b"
+    # Once claimed, nobody else can take it
+    third = suno.JobJournal(journal_path, owner="c", lease=0.3)
+    assert third.claim_orphaned() == []
+    other.close()
+    third.close()
+
+
+def test_restarted_worker_reclaims_its_own_jobs_at_once(suno, journal_path):
+    before = suno.JobJournal(journal_path, owner="render-1")
+    entry_id = add_job(before)
+    before.close()
+
+    after = suno.JobJournal(journal_path, owner="render-1")
+    assert [entry["id"] for entry in after.claim_orphaned()] == [entry_id]
+    # Its own live jobs are not claimed twice
+    assert after.claim_orphaned() == []
+    after.close()
+
+
+def test_resume_finishes_an_interrupted_job(suno, fake_suno, make_uploader, journal_path,
+                                            midi_file, tmp_path):
+    fake_suno.job_time = 1.0
+    output = tmp_path / "out.mp3"
+    journal = suno.JobJournal(journal_path, owner="render-1")
+    with make_uploader(journal=journal) as uploader:
+        with pytest.raises(suno.DeadlineExceeded):
+            uploader.run_job(midi_file, str(output), deadline=suno.Deadline(0.3))
+    journal.close()
+    assert not output.exists()
+
+    journal = suno.JobJournal(journal_path, owner="render-1")
+    with make_uploader(journal=journal) as uploader:
+        results = uploader.resume(timeout=10)
+    journal.close()
+
+    assert [(r["result"]["status"], r["error"]) for r in results] == [("completed", None)]
+    assert output.exists()
+    assert fake_suno.count("generate") == 1
+
+
+def test_unknown_job_is_marked_failed_and_not_retried(suno, make_uploader, journal_path):
+    journal = suno.JobJournal(journal_path, owner="render-1")
+    entry_id = add_job(journal, stage="generated", job_id="nonexistent")
+    journal.close()
+
+    journal = suno.JobJournal(journal_path, owner="render-1")
+    with make_uploader(journal=journal) as uploader:
+        first = uploader.resume(timeout=1)
+        second = uploader.resume(timeout=1)
+    entry = journal.get(entry_id)
+    journal.close()
+
+    assert first[0]["error"].status_code == 404
+    assert second == []
+    assert entry["stage"] == suno.JobJournal.FAILED
+
+
+def test_job_failing_transiently_is_released_for_a_later_resume(suno, fake_suno, make_uploader,
+                                                                 journal_path):
+    fake_suno.jobs["slow"] = {"done_at": time.monotonic() + 60, "fail": False, "audio_url": None}
+    journal = suno.JobJournal(journal_path, owner="render-1")
+    entry_id = add_job(journal, stage="generated", job_id="slow")
+    journal.close()
+
+    journal = suno.JobJournal(journal_path, owner="render-1")
+    with make_uploader(journal=journal) as uploader:
+        first = uploader.resume(timeout=0.2)
+        second = uploader.resume(timeout=0.2)
+    entry = journal.get(entry_id)
+    journal.close()
+
+    assert isinstance(first[0]["error"], TimeoutError)
+    assert len(second) == 1
+    assert entry["stage"] == "generated"
@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from conftest import make_midi
+
+
+def make_jobs(tmp_path, count):
+    jobs = []
+    for i in range(count):
+        path = tmp_path / f"song{i}.mid"
+        path.write_bytes(make_midi(tracks=1 + i % 3))
+        jobs.append({"midi_path": str(path), "output_path": str(tmp_path / f"out{i}.mp3")})
+    return jobs
+
+
+def test_stages_overlap_across_files(suno, uploader, fake_suno, tmp_path):
+    fake_suno.job_time = 0.3
+    jobs = make_jobs(tmp_path, 12)
+    pipeline = suno.BatchPipeline(uploader, polling=suno.FixedPolling(0.05))
+    start = time.monotonic()
+
+    results = list(pipeline.run(iter(jobs)))
+
+    # Twelve 0.3 s generations one after another would take over 3.6 s
+    assert time.monotonic() - start < 2.5
+    assert all(result["error"] is None for result in results)
+    assert all(result["result"]["status"] == "completed" for result in results)
+    assert sorted(result["job"]["output_path"] for result in results) == \
+        sorted(job["output_path"] for job in jobs)
+
+
+def test_failures_are_reported_per_job(suno, uploader, tmp_path):
+    jobs = make_jobs(tmp_path, 3)
+    jobs.append({"midi_path": str(tmp_path / "missing.mid"), "output_path": "x.mp3"})
+    jobs[0]["prompt"] = "fail"
+    pipeline = suno.BatchPipeline(uploader, polling=suno.FixedPolling(0.05))
+
+    errors = {result["job"]["midi_path"]: type(result["error"]).__name__
+              for result in pipeline.run(jobs) if result["error"] is not None}
+
+    assert errors == {jobs[0]["midi_path"]: "GenerationFailedError",
+                      jobs[3]["midi_path"]: "FileNotFoundError"}
+
+
+def test_input_is_read_only_as_fast_as_the_pipeline_accepts(suno, uploader, tmp_path):
+    jobs = make_jobs(tmp_path, 2) * 50
+    taken = []
+
+    def feed():
+        for job in jobs:
+            taken.append(job)
+            yield job
+
+    pipeline = suno.BatchPipeline(uploader, queue_size=2, max_generating=2,
+                                  polling=suno.FixedPolling(0.05))
+    run = pipeline.run(feed())
+    next(run)
+    run.close()
+
+    assert len(taken) < 20
+
+
+def test_breaking_early_stops_every_worker(suno, uploader, tmp_path):
+    pipeline = suno.BatchPipeline(uploader, polling=suno.FixedPolling(0.05))
+
+    for _ in pipeline.run(make_jobs(tmp_path, 8)):
+        break
+
+    assert not [thread.name for thread in threading.enumerate()
+                if thread.name.startswith(("suno-pipeline", "suno-job-watcher"))]
@@ -0,0 +1,57 @@
+from itertools import islice
+
+import pytest
+
+
+@pytest.fixture
+def clock(suno, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(suno.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_backoff_grows_until_max_interval(suno):
+    strategy = suno.ExponentialBackoffPolling(initial=1, multiplier=2, max_interval=5, jitter=0)
+
+    assert list(islice(strategy.delays("job"), 6)) == [0, 1, 2, 4, 5, 5]
+
+
+def test_adaptive_first_delay_is_learned_per_style_and_duration(suno, clock):
+    strategy = suno.AdaptivePolling(initial=1, multiplier=2, max_interval=3, jitter=0,
+                                    smoothing=0.5, lead=0.5)
+    for job_id, elapsed in (("a", 40), ("b", 20)):
+        strategy.job_submitted(job_id, "pop", 60)
+        clock[0] += elapsed
+        strategy.job_finished(job_id, {"status": "completed"})
+
+    assert strategy.expected_duration("pop", 60) == 30
+    assert strategy.expected_duration("rock", 60) is None
+
+    strategy.job_submitted("c", "pop", 60)
+    clock[0] += 5
+    assert list(islice(strategy.delays("c"), 5)) == [10, 1, 2, 3, 3]
+    strategy.job_submitted("d", "rock", 60)
+    assert list(islice(strategy.delays("d"), 3)) == [0, 1, 2]
+
+
+def test_adaptive_forgets_the_oldest_jobs_beyond_max_tracked(suno, clock):
+    strategy = suno.AdaptivePolling(jitter=0, max_tracked_jobs=2)
+    strategy.job_submitted("a", "pop", 60)
+    clock[0] += 10
+    strategy.job_submitted("b", "pop", 60)
+    strategy.job_submitted("c", "pop", 60)
+    clock[0] += 20
+    for job_id in ("a", "b", "c"):
+        strategy.job_finished(job_id, {"status": "completed"})
+
+    # a was forgotten when c arrived, so only b's and c's 20 s were learned
+    assert strategy.expected_duration("pop", 60) == 20
+
+
+def test_failed_jobs_are_not_learned_from(suno, clock):
+    strategy = suno.AdaptivePolling(jitter=0)
+    strategy.job_submitted("a", "pop", 60)
+    clock[0] += 30
+    strategy.job_finished("a", {"status": "failed"})
+
+    assert strategy.expected_duration("pop", 60) is None
@@ -0,0 +1,50 @@
+import multiprocessing
+import time
+
+import pytest
+
+RATE, BURST = 20.0, 5.0
+
+
+def acquire_until(path, stop_at, counts):
+    # Runs in a forked worker, where the uploader module is already loaded
+    import suno_midi_uploader as suno
+
+    limiter = suno.SharedRateLimiter(path, {"upload": (RATE, BURST)})
+    acquired = 0
+    try:
+        while True:
+            limiter.acquire("upload", timeout=stop_at - time.time())
+            acquired += 1
+    except TimeoutError:
+        pass
+    finally:
+        limiter.close()
+    counts.put(acquired)
+
+
+def test_processes_share_one_budget(suno, tmp_path):
+    path = str(tmp_path / "limits.bin")
+    # Create the file, and with it a full bucket, before the clock starts
+    suno.SharedRateLimiter(path, {"upload": (RATE, BURST)}).close()
+    start = time.time()
+    context = multiprocessing.get_context("fork")
+    counts = context.Queue()
+    workers = [context.Process(target=acquire_until, args=(path, start + 1.0, counts))
+               for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    total = sum(counts.get(timeout=10) for _ in workers)
+    for worker in workers:
+        worker.join(timeout=10)
+    elapsed = time.time() - start
+
+    assert BURST < total <= RATE * elapsed + BURST
+
+
+def test_different_layout_is_rejected(suno, tmp_path):
+    path = str(tmp_path / "limits.bin")
+    suno.SharedRateLimiter(path, {"upload": (RATE, BURST)}, endpoints=["upload"]).close()
+
+    with pytest.raises(ValueError, match="different rate limiter layout"):
+        suno.SharedRateLimiter(path, {"upload": (RATE, BURST)}, endpoints=["upload", "status"])
@@ -0,0 +1,52 @@
+import pytest
+
+from conftest import make_midi
+
+
+def idempotency_keys(fake_suno, endpoint):
+    return [headers.get("Idempotency-Key") for seen, headers in fake_suno.requests
+            if seen == endpoint]
+
+
+def test_5xx_is_retried_with_the_same_idempotency_key(uploader, fake_suno):
+    fake_suno.fail_next["upload"] = [502, 503]
+
+    result = uploader.upload_midi(make_midi())
+
+    keys = idempotency_keys(fake_suno, "upload")
+    assert len(keys) == 3 and len(set(keys)) == 1
+    assert result["_client"] == {"retries": 2, "idempotency_key": keys[0]}
+
+
+def test_caller_supplied_idempotency_key_is_sent(uploader, fake_suno):
+    midi_id = uploader.upload_midi(make_midi())["midi_id"]
+
+    uploader.generate_from_midi_id(midi_id, idempotency_key="abc")
+
+    assert idempotency_keys(fake_suno, "generate") == ["abc"]
+
+
+def test_retries_give_up_after_max_retries(uploader, fake_suno):
+    fake_suno.fail_next["generate"] = [500] * 10
+
+    with pytest.raises(Exception, match="Generation failed: 500"):
+        uploader.generate_from_midi_id("midi")
+
+    assert fake_suno.count("generate") == 4
+
+
+def test_429_raises_rate_limit_error_after_retries(suno, fake_suno, make_uploader):
+    fake_suno.fail_next["status"] = [429] * 10
+    with make_uploader(rate_limit_retries=1) as uploader:
+        with pytest.raises(suno.RateLimitError):
+            uploader.get_generation_status("job")
+
+    assert fake_suno.count("status") == 2
+
+
+def test_rate_limiter_acquire_times_out(suno):
+    limiter = suno.RateLimiter({"status": (1, 1)})
+    limiter.acquire("status")
+
+    with pytest.raises(TimeoutError):
+        limiter.acquire("status", timeout=0.1)
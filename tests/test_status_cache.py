@@ -0,0 +1,45 @@
+import time
+
+from conftest import make_midi
+
+
+def test_final_status_is_served_from_cache(fake_suno, uploader):
+    fake_suno.job_time = 0.1
+    job_id = uploader.generate_from_midi(make_midi())["job_id"]
+    assert uploader.get_generation_status(job_id)["status"] == "processing"
+    time.sleep(0.15)
+    first = uploader.get_generation_status(job_id)
+    first["status"] = "mutated"
+    for _ in range(10):
+        assert uploader.get_generation_status(job_id)["status"] == "completed"
+
+    assert fake_suno.count("status") == 2
+
+
+def test_non_final_statuses_are_not_cached(suno):
+    cache = suno.JobStatusCache()
+
+    assert not cache.put("job", {"job_id": "job", "status": "processing"})
+    assert cache.get("job") is None
+
+
+def test_memory_tier_evicts_least_recently_used(suno):
+    cache = suno.JobStatusCache(max_entries=2)
+    for job_id in ("a", "b"):
+        cache.put(job_id, {"job_id": job_id, "status": "completed"})
+    cache.get("a")
+    cache.put("c", {"job_id": "c", "status": "failed"})
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+
+
+def test_disk_tier_survives_reopening(suno, tmp_path):
+    path = str(tmp_path / "statuses.sqlite3")
+    cache = suno.JobStatusCache(path=path)
+    cache.put("job", {"job_id": "job", "status": "completed", "_client": {"retries": 1}})
+    cache.close()
+
+    reopened = suno.JobStatusCache(path=path)
+    assert reopened.get("job") == {"job_id": "job", "status": "completed"}
+    reopened.close()
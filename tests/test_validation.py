@@ -0,0 +1,32 @@
+import pytest
+
+from conftest import make_midi
+
+
+def test_validate_midi_accepts_valid_data(suno):
+    suno.validate_midi(make_midi(tracks=2))
+
+
+def test_validate_midi_rejects_corrupt_data(suno):
+    with pytest.raises(suno.InvalidMIDIError):
+        suno.validate_midi(make_midi()[:-3])
+
+
+def test_directory_check_reports_each_bad_file(suno, tmp_path, monkeypatch):
+    (tmp_path / "good.mid").write_bytes(make_midi())
+    (tmp_path / "corrupt.mid").write_bytes(b"MThd garbage")
+    (tmp_path / "locked.mid").write_bytes(make_midi())
+    (tmp_path / "notes.txt").write_text("not midi")
+    real_validate = suno.validate_midi
+
+    def validate(path):
+        if isinstance(path, str) and path.endswith("locked.mid"):
+            raise PermissionError(13, "Permission denied", path)
+        return real_validate(path)
+
+    monkeypatch.setattr(suno, "validate_midi", validate)
+    failures = suno.validate_midi_directory(str(tmp_path))
+
+    assert sorted(path.rsplit("/", 1)[1] for path in failures) == ["corrupt.mid", "locked.mid"]
+    assert isinstance(failures[str(tmp_path / "corrupt.mid")], suno.InvalidMIDIError)
+    assert isinstance(failures[str(tmp_path / "locked.mid")], PermissionError)
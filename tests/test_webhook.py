@@ -0,0 +1,95 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from conftest import make_midi
+
+
+def post(url: str, body) -> int:
+    data = body if isinstance(body, bytes) else json.dumps(body).encode()
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+@pytest.fixture
+def receiver(suno):
+    with suno.WebhookReceiver(token="secret") as receiver:
+        yield receiver
+
+
+def test_completed_callback_resolves_future(receiver):
+    future = receiver.expect("job-1")
+    status = {"job_id": "job-1", "status": "completed", "audio_url": "http://x/a.mp3"}
+
+    assert post(receiver.callback_url, status) == 204
+    assert future.result(timeout=5) == status
+
+
+def test_failed_callback_raises_generation_failed(suno, receiver):
+    future = receiver.expect("job-2")
+
+    assert post(receiver.callback_url, {"job_id": "job-2", "status": "failed", "error": "boom"}) == 204
+    with pytest.raises(suno.GenerationFailedError) as excinfo:
+        future.result(timeout=5)
+    assert excinfo.value.status["error"] == "boom"
+
+
+def test_bad_token_is_rejected(receiver):
+    future = receiver.expect("job-3")
+    bad_url = receiver.callback_url.replace("token=secret", "token=wrong")
+
+    assert post(bad_url, {"job_id": "job-3", "status": "completed"}) == 403
+    assert not future.done()
+
+
+def test_malformed_callbacks_are_rejected(receiver):
+    assert post(receiver.callback_url, b"not json") == 400
+    assert post(receiver.callback_url, {"status": "completed"}) == 400
+
+
+def test_callback_before_expect_is_kept(receiver):
+    status = {"job_id": "job-4", "status": "completed", "audio_url": "http://x/b.mp3"}
+
+    assert post(receiver.callback_url, status) == 204
+    assert receiver.is_expected("job-4")
+    assert receiver.expect("job-4").result(timeout=0) == status
+
+
+def test_non_final_status_is_ignored(receiver):
+    future = receiver.expect("job-5")
+
+    assert post(receiver.callback_url, {"job_id": "job-5", "status": "processing"}) == 204
+    assert not future.done()
+
+
+def test_wait_for_completion_uses_pushed_callback(fake_suno, make_uploader, receiver):
+    fake_suno.job_time = 0.3
+    with make_uploader(webhook=receiver) as uploader:
+        job = uploader.generate_from_midi(make_midi())
+        status = uploader.wait_for_completion(job["job_id"], timeout=10)
+
+    assert status["status"] == "completed"
+    # The callback arrived before the fallback poll was due
+    assert fake_suno.count("status") == 0
+
+
+def test_fallback_poll_resolves_a_lost_callback(suno, fake_suno, make_uploader):
+    fake_suno.job_time = 0.1
+    job_status = fake_suno.job_status
+    # Without a job_id the callback is rejected, and the status body lacks one too
+    fake_suno.job_status = lambda job_id: {k: v for k, v in job_status(job_id).items()
+                                           if k != "job_id"}
+    with suno.WebhookReceiver(fallback_interval=0.3) as receiver:
+        with make_uploader(webhook=receiver) as uploader:
+            job = uploader.generate_from_midi(make_midi())
+            status = uploader.wait_for_completion(job["job_id"], timeout=10)
+
+    assert status == {"job_id": job["job_id"], "status": "completed",
+                      "audio_url": status["audio_url"]}
+    assert fake_suno.count("status") >= 1